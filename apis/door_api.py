@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from logger import sys_logger as logger
 
 # 导入全局实例
@@ -11,7 +12,7 @@ router = APIRouter(prefix="/api/door", tags=["玻璃门"])
 # 3. 玻璃门模块
 # ==========================================
 @router.get("/status", response_model=DoorStatusResponse, tags=["玻璃门"])
-def get_door_status() -> DoorStatusResponse:
+async def get_door_status() -> DoorStatusResponse:
     '''获取所有玻璃门状态
     
     Returns:
@@ -19,18 +20,15 @@ def get_door_status() -> DoorStatusResponse:
         message: str
         data: dict
     '''
-    status_dict = {}
-    for i in range(1, 7): 
-        result = door_controller.get_door_status(i)
-        if result.get("status") == "success":
-            status_dict[i] = result.get("data")
-        else:
-            return DoorStatusResponse(code=500, message=result.get("message", "未知错误"))
-    return DoorStatusResponse(code=200, message="玻璃门状态获取成功", data=status_dict)
+    # 六扇门共用同一个ZMQ REQ socket，无法并发收发；按从站批量读取，3次往返得到6扇门状态
+    result = await run_in_threadpool(door_controller.get_all_door_status)
+    if result.get("status") != "success":
+        return DoorStatusResponse(code=500, message=result.get("message", "未知错误"))
+    return DoorStatusResponse(code=200, message="玻璃门状态获取成功", data=result.get("data"))
 
 
 @router.post("/control", response_model=DoorActionResponse, tags=["玻璃门"])
-def control_door(request: DoorActionRequest) -> DoorActionResponse:
+async def control_door(request: DoorActionRequest) -> DoorActionResponse:
     '''控制玻璃门
     
     Args:
@@ -44,8 +42,8 @@ def control_door(request: DoorActionRequest) -> DoorActionResponse:
         - message: str
         - data: str
     '''
-    logger.log(f"玻璃门手动操作: ID={request.door_id}, Action={request.action}", "INFO")
-    result = door_controller.send_command(request.door_id, DoorActionCode(request.action))
+    logger.info("玻璃门手动操作: ID={}, Action={}", request.door_id, request.action)
+    result = await run_in_threadpool(door_controller.send_command, request.door_id, DoorActionCode(request.action))
     if result.get("status") != "success": 
         return DoorActionResponse(code=500, message=result.get("message", "未知错误"))
     else:
@@ -1,16 +1,41 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Request, UploadFile
+from fastapi.routing import APIRoute
 from logger import sys_logger as logger
+from config import get_settings
 
 # 导入全局实例
-from flows.thermal_flow import thermal_flow_mgr
-from flows.mix_flow import mix_flow_mgr
-from flows.xrd_flow import xrd_flow_mgr
 from services.mixer import mixer_service
+from services.experiment import experiment_service
 
-router = APIRouter(prefix="/api/experiment", tags=["实验"])
+# 允许上传的Excel文件扩展名（不含点，小写）
+_ALLOWED_EXCEL_EXTS = frozenset({"xlsx", "xls"})
+# 上传大小未知时分块读取检查的块大小(字节)
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _upload_too_large(max_upload_size: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"上传文件过大，最大允许 {max_upload_size // (1024 * 1024)} MB")
+
+
+class _UploadLimitRoute(APIRoute):
+    """在框架读取、解析multipart请求体之前，按 Content-Length 拒绝过大的上传"""
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request):
+            max_upload_size = get_settings().max_upload_size
+            length = request.headers.get("content-length")
+            if length is not None and length.isdigit() and int(length) > max_upload_size:
+                raise _upload_too_large(max_upload_size)
+            return await handler(request)
+
+        return limited_handler
+
+
+router = APIRouter(prefix="/api/experiment", tags=["实验"], route_class=_UploadLimitRoute)
 
 @router.post("/flux", tags=["实验"])
-async def start_experiment(file: UploadFile = File(...)):
+async def start_experiment(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """
     开始试验的总入口
     1. 配料，上传Excel文件，解析配料数据
@@ -18,49 +43,56 @@ async def start_experiment(file: UploadFile = File(...)):
     3. 上料
     4. 下料
     5. xrd衍射仪
+    解析成功后试验流程在后台执行，立即返回任务ID，可通过 GET /api/experiment/{task_id} 查询进度
     """
+    # 检查文件大小（带 Content-Length 的请求已在解析请求体之前检查过）
+    max_upload_size = get_settings().max_upload_size
+    if file.size is None:
+        # 大小未知（如分块传输）时分块读取，超过上限即拒绝
+        total = 0
+        await file.seek(0)
+        while total <= max_upload_size:
+            chunk = await file.read(min(_UPLOAD_CHUNK_SIZE, max_upload_size + 1 - total))
+            if not chunk:
+                break
+            total += len(chunk)
+        if total > max_upload_size:
+            raise _upload_too_large(max_upload_size)
+    elif file.size > max_upload_size:
+        raise _upload_too_large(max_upload_size)
+
     try:
         # 检查文件类型
-        if not file.filename.lower().endswith(('.xlsx', '.xls')):
+        ext = file.filename.rpartition('.')[2].lower()
+        if ext not in _ALLOWED_EXCEL_EXTS:
             return {"status": "error", "message": "只支持上传Excel文件(.xlsx, .xls)"}
 
-        # 读取上传的Excel文件
-        contents = await file.read()
-
-        #########################################################
-        # 1. 配料 #
-        #########################################################
-        mixer_model = await mixer_service.parse_mixer_tasks_from_excel(contents)
+        # 上传文件已由框架写入SpooledTemporaryFile（超过阈值自动落盘），直接从临时文件解析，不再整体读入内存
+        await file.seek(0)
+        mixer_model = await mixer_service.parse_mixer_tasks_from_excel(file.file)
         logger.log(f"Excel文件解析成功，任务名称: {mixer_model.task_name}", "INFO")
-
-        mix_flow_mgr.run(mixer_model)
-
-        #########################################################
-        # 2. 熔封 #
-        #########################################################
-
-        # TODO API为完成，人工确认熔封完成
-
-        #########################################################
-        # 3. 热处理 # 包括高温炉、离心机工序
-        #########################################################
-
-        thermal_flow_mgr.run()
-
-        #########################################################
-        # 4. xrd衍射仪 #
-        #########################################################
-        xrd_flow_mgr.run()
-
-        return {
-            "status": "success",
-            "message": "Excel文件解析成功",
-            "task_data": mixer_model.model_dump_json()
-        }
-
     except Exception as e:
         logger.log(f"Excel文件解析失败: {str(e)}", "ERROR")
         return {
             "status": "error",
             "message": f"Excel文件解析失败: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+    task_id = experiment_service.create_task(mixer_model.task_name)
+    background_tasks.add_task(experiment_service.run_pipeline, task_id, mixer_model)
+    return {
+        "status": "success",
+        "message": "Excel文件解析成功，试验流程已在后台启动",
+        "task_id": task_id,
+        "task_data": mixer_model.model_dump(mode="json")
+    }
+
+
+@router.get("/{task_id}", tags=["实验"])
+async def get_experiment_status(task_id: str):
+    """查询试验任务进度
+    status: pending=等待执行, running=执行中, success=完成, error=失败；step 为当前工序"""
+    task = experiment_service.get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"试验任务不存在: {task_id}")
+    return {"status": "success", "data": task}
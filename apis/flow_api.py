@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Body
+from fastapi import APIRouter
+from fastapi.responses import Response
+import orjson
 from logger import sys_logger as logger
+from schemas.flow import ThermalLoadRequest, ThermalUnloadRequest
 
 # 导入全局实例
 from flows.thermal_flow import thermal_flow_mgr
@@ -9,34 +12,38 @@ from flows.xrd_flow import xrd_flow_mgr
 router = APIRouter(prefix="/api/flow", tags=["流程"])
 
 @router.post("/thermal/confirm_continue", tags=["热处理流程"])
-def confirm_flow_continue():
+async def confirm_flow_continue():
     """流程暂停时的确认继续接口"""
     thermal_flow_mgr.user_confirm()
     return {"msg": "确认指令已发送"}
 
 
 @router.post("/thermal/load", tags=["热处理流程"])
-def start_input_flow(shelf_id: int = Body(...), oven_id: int = Body(...), qty: int = Body(...)):
+async def start_input_flow(payload: ThermalLoadRequest):
     """启动上料流程（货架 -> 炉子）。
 在 Request body 中输入 shelf_id (货架号)、oven_id (炉子号)、qty (数量)，点击 Execute 执行。执行后系统将自动打开对应炉盖与门，并暂停等待人工确认。"""
-    thermal_flow_mgr.load(shelf_id, oven_id, qty)
-    return {"msg": "上料流程已启动", "detail": f"货架{shelf_id} -> 炉子{oven_id} (数量:{qty})"}
+    thermal_flow_mgr.load(payload.shelf_id, payload.oven_id, payload.qty)
+    return {"msg": "上料流程已启动", "detail": f"货架{payload.shelf_id} -> 炉子{payload.oven_id} (数量:{payload.qty})"}
 
 
 @router.post("/thermal/unload", tags=["热处理流程"])
-def start_output_flow(oven_id: int = Body(...), slot_id: int = Body(...), shelf_id: int = Body(...)):
+async def start_output_flow(payload: ThermalUnloadRequest):
     """启动出料流程（炉子 -> 离心机 -> 货架）。
 在 Request body 中输入 oven_id (炉子号)、slot_id (穴位号)、shelf_id (货架号)，点击 Execute 执行。此流程包含三次暂停，需配合确认接口使用。"""
-    thermal_flow_mgr.unload(oven_id, slot_id, shelf_id)
-    return {"msg": "出料流程已启动", "detail": f"炉子{oven_id}(穴{slot_id}) -> 离心机 -> 货架{shelf_id}"}
+    thermal_flow_mgr.unload(payload.oven_id, payload.slot_id, payload.shelf_id)
+    return {"msg": "出料流程已启动", "detail": f"炉子{payload.oven_id}(穴{payload.slot_id}) -> 离心机 -> 货架{payload.shelf_id}"}
 
 
 @router.get("/thermal/status", tags=["热处理流程"])
-def get_thermal_flow_status():
+async def get_thermal_flow_status():
     """获取当前流程运行状态。
 返回数据中 running 表示是否运行中，step_info 显示当前步骤。若显示"等待确认..."，请使用确认接口。"""
-    return {
-        "running": thermal_flow_mgr.running,
-        "step_info": thermal_flow_mgr.current_step_info,
-        "remaining_tasks": len(thermal_flow_mgr.task_queue)
-    }
\ No newline at end of file
+    # 前端高频轮询的小接口：直接用orjson编码后返回，跳过jsonable_encoder和响应类的二次处理
+    return Response(
+        content=orjson.dumps({
+            "running": thermal_flow_mgr.running,
+            "step_info": thermal_flow_mgr.current_step_info,
+            "remaining_tasks": len(thermal_flow_mgr.task_queue)
+        }),
+        media_type="application/json"
+    )
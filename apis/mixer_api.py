@@ -6,6 +6,6 @@ from logger import sys_logger as logger
 router = APIRouter(prefix="/api/mixer", tags=["配料"])
 
 @router.get("/status", tags=["配料"])
-def get_mixer_status():
+async def get_mixer_status():
     status_dict = {}
     return {"source": "硬件实时反馈", "mixers": status_dict}
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from logger import sys_logger as logger
 
@@ -22,7 +23,7 @@ from services.oven import oven_service
 router = APIRouter(prefix="/api/oven", tags=["炉子"])
 
 @router.post("/control/lid", tags=["炉盖"])
-def control_oven_lid(request: OvenLidActionRequest):
+async def control_oven_lid(request: OvenLidActionRequest):
     '''控制炉盖
     
     Args:
@@ -35,15 +36,15 @@ def control_oven_lid(request: OvenLidActionRequest):
         message: str
         data: str
     '''
-    logger.log(f"炉盖手动操作: ID={request.oven_id}, Action={request.action}", "INFO")
-    result = oven_controller.control_lid(request.oven_id, OvenLidActionCode(request.action))
+    logger.info("炉盖手动操作: ID={}, Action={}", request.oven_id, request.action)
+    result = await run_in_threadpool(oven_controller.control_lid, request.oven_id, OvenLidActionCode(request.action))
     if result.get("status") != "success": 
         return OvenActionResponse(code=500, message=result.get("message", "未知错误"))
     else:
         return OvenActionResponse(code=200, message="炉盖操作成功")
 
 @router.post("/control", tags=["炉子"])
-def control_oven(request: OvenActionRequest):
+async def control_oven(request: OvenActionRequest):
     '''控制炉子
     
     Args:
@@ -57,16 +58,16 @@ def control_oven(request: OvenActionRequest):
         message: str
         data: str
     '''
-    logger.log(f"炉子手动操作: ID={request.oven_id}, Action={request.action}", "INFO")
-    result = oven_controller.control_oven(request.oven_id, OvenActionCode(request.action))
+    logger.info("炉子手动操作: ID={}, Action={}", request.oven_id, request.action)
+    result = await run_in_threadpool(oven_controller.control_oven, request.oven_id, OvenActionCode(request.action))
     if result.get("status") != "success": 
         return OvenActionResponse(code=500, message=result.get("message", "未知错误"))
     else:
         return OvenActionResponse(code=200, message="炉子操作成功")
 
 @router.get("/status", tags=["炉子"], response_model=OvenStatusResponse)
-def get_oven_status() -> OvenStatusResponse:
-    result = oven_controller.get_running_status()
+async def get_oven_status() -> OvenStatusResponse:
+    result = await run_in_threadpool(oven_controller.get_running_status)
     if result.get("status") != "success":
         return OvenStatusResponse(code=500, message=result.get("message", "未知错误"))
     else:
@@ -91,7 +92,7 @@ def get_oven_status() -> OvenStatusResponse:
             return OvenStatusResponse(code=200, message="炉子运行状态获取成功", data=oven_status_list)
 
 @router.post("/curve", tags=["炉子"], response_model=OvenCurveResponse)
-def set_oven_curve(request: OvenCurveRequest) -> OvenCurveResponse:
+async def set_oven_curve(request: OvenCurveRequest) -> OvenCurveResponse:
     '''上传炉子运行曲线
     
     Args:
@@ -116,11 +117,11 @@ def set_oven_curve(request: OvenCurveRequest) -> OvenCurveResponse:
         return OvenCurveResponse(code=500, message="没有有效的曲线数据")
 
     # 2. 执行硬件下传
-    result = oven_controller.set_curve_points(request.oven_id, processed_points)
+    result = await run_in_threadpool(oven_controller.set_curve_points, request.oven_id, processed_points)
 
     # 3. 自主选择保存逻辑
     if result.get("status") == "success" and request.curve_name:
-        oven_service.persist_oven_curve(request.oven_id, request.curve_name, processed_points)
+        await run_in_threadpool(oven_service.persist_oven_curve, request.oven_id, request.curve_name, processed_points)
 
     if result.get("status") != "success":
         return OvenCurveResponse(code=500, message=result.get("message", "未知错误"))
@@ -128,21 +129,21 @@ def set_oven_curve(request: OvenCurveRequest) -> OvenCurveResponse:
         return OvenCurveResponse(code=200, message="炉子运行曲线设置成功", data=processed_points)
 
 @router.get("/curve", tags=["炉子"], response_model=OvenCurveListResponse)
-def get_oven_curve_list() -> OvenCurveListResponse:
+async def get_oven_curve_list() -> OvenCurveListResponse:
     '''查询已保存工艺列表
     
     Returns:
         OvenCurveListResponse
     '''
 
-    curve_list = oven_service.get_oven_curve_list()
+    curve_list = await run_in_threadpool(oven_service.get_oven_curve_list)
     if not curve_list:
         return OvenCurveListResponse(code=500, message="没有已保存工艺")
     else:
         return OvenCurveListResponse(code=200, message="炉子运行曲线列表获取成功", data=curve_list)
 
 @router.post("/curve/name", tags=["炉子"], response_model=OvenCurveResponse)
-def set_oven_curve_by_name(request: OvenCurveByNameRequest) -> OvenCurveResponse:
+async def set_oven_curve_by_name(request: OvenCurveByNameRequest) -> OvenCurveResponse:
     '''直接调用数据库里存好的曲线，不用重新填表
     
     Args:
@@ -150,11 +151,11 @@ def set_oven_curve_by_name(request: OvenCurveByNameRequest) -> OvenCurveResponse
     Returns:
         OvenCurveResponse
     '''
-    processed_points =  oven_service.get_oven_curve_by_name(request.curve_name)
+    processed_points = await run_in_threadpool(oven_service.get_oven_curve_by_name, request.curve_name)
     if not processed_points:
         return OvenCurveResponse(code=500, message="没有找到该工艺曲线")
 
-    result = oven_controller.set_curve_points(request.oven_id, processed_points)
+    result = await run_in_threadpool(oven_controller.set_curve_points, request.oven_id, processed_points)
     if result.get("status") != "success":
         return OvenCurveResponse(code=500, message=result.get("message", "未知错误"))
     else:
@@ -1,11 +1,15 @@
 from typing import Literal
-from fastapi import APIRouter, Body, HTTPException
-import time
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+import asyncio
+import orjson
 from snap7.type import Area
 from logger import sys_logger as logger
+from schemas.robot import TaskData
 
 # 导入全局实例
 from devices.robot_core import robot_controller
+from services.plc import plc_poller, plc_commands
 
 router = APIRouter(prefix="/api/plc", tags=["PLC"])
 
@@ -13,7 +17,7 @@ router = APIRouter(prefix="/api/plc", tags=["PLC"])
 # 4. PLC 模块
 # ==========================================
 @router.get("/status", tags=["PLC"])
-def get_plc_status():
+async def get_plc_status(nocache: bool = False):
     """获取 PLC 连接及机器人状态。
         第 1 个值 (Index 0): 对应 M10.0 (任务下发) -> false (未触发)
         第 2 个值 (Index 1): 对应 M10.1 (任务清除) -> false
@@ -24,23 +28,51 @@ def get_plc_status():
          DB1.218.0 (原点状态) - 1=原点
          DB1.218.1 (夹具状态) - 1=打开
          DB1.242 (系统状态) - 0=断线, 1=空闲, 2=执行中, 3=完成, 4=失败
-         DB2.40 (任务状态) - 0=无任务, 1=有任务"""
+         DB2.40 (任务状态) - 0=无任务, 1=有任务
+        nocache=1 时跳过缓存的快照，直接读取PLC（调试用）"""
     # 注意：此处不频繁调用 log，避免日志刷屏，仅在连接状态变化时由 connect 记录
-    return robot_controller.get_status()
+    # 优先返回后台轮询的最新快照；尚无快照或快照过期时直接读取PLC（并发请求合并为一次读取）
+    return await plc_poller.read_status(nocache)
+
+
+@router.get("/status/stream", tags=["PLC"])
+async def stream_plc_status():
+    """以SSE(Server-Sent Events)推送PLC状态。
+    连接后立即推送一次当前状态，之后仅在状态变化时推送，数据格式同 /api/plc/status；
+    无变化时每15秒发送一次注释行保活。前端可用 EventSource 订阅，无需轮询。"""
+    async def event_source():
+        queue = plc_poller.subscribe()
+        try:
+            status = plc_poller.latest()
+            if status is not None:
+                yield b"data: " + orjson.dumps(status) + b"\n\n"
+            while True:
+                try:
+                    status = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"data: " + orjson.dumps(status) + b"\n\n"
+        finally:
+            plc_poller.unsubscribe(queue)
+
+    return StreamingResponse(event_source(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 
 @router.post("/task", tags=["PLC"])
-def set_task(tid: int = Body(...), st: int = Body(...), qty: int = Body(...)):
+async def set_task(payload: TaskData):
     """写入 PLC 任务数据 (底层接口)。
     手动向 DB3 写入任务。需在 Body 中填写 tid (任务ID), st (站点), qty (数量)。一般仅供调试使用。"""
-    success = robot_controller.write_task(tid, st, qty)
+    success = await plc_commands.submit(robot_controller.write_task, payload.tid, payload.st, payload.qty)
+    plc_poller.invalidate()
     if not success:
         raise HTTPException(status_code=500, detail=f"写入任务数据失败")
     return {"success": success}
 
 
 @router.post("/toggle_m/{bit}", tags=["PLC"])
-def toggle_m(bit: int):
+async def toggle_m(bit: int):
     """翻转控制M10.x区信号。在bit输入位地址(0 - 5)，执行后将对应的M10.x信号取反。
     M10.0: 任务下发	标签3	反转控制
     M10.1: 任务清除	标签8	反转控制
@@ -52,45 +84,43 @@ def toggle_m(bit: int):
     """
     if bit < 0 or bit > 5:
         raise ValueError("bit 必须在 0 到 5 之间")
-    success = robot_controller.toggle_m(10, bit)
+    success = await plc_commands.submit(robot_controller.toggle_m, 10, bit)
+    plc_poller.invalidate()
     if not success:
         raise HTTPException(status_code=500, detail=f"翻转控制M10.{bit}区信号失败")
     return {"success": success}
 
 
 @router.post("/pulse_m/{bit}", tags=["PLC"])
-def pulse_m(bit: int):
+async def pulse_m(bit: int):
     """点动控制M10.x区信号。
     在bit输入位地址(0 - 5)，执行后将对应的M10.x信号置位1 -> 等待0.5s -> 复位0 (安全模式)。"""
     if bit < 0 or bit > 5:
         raise ValueError("bit 必须在 0 到 5 之间")
-    success = robot_controller.pulse_m(10, bit)
+    success = await plc_commands.pulse_m(10, bit)
+    plc_poller.invalidate()
     if not success:
         raise HTTPException(status_code=500, detail=f"点动控制M10.{bit}区信号失败")
     return {"success": success}
 
 
+# 机器人指令 -> 返回执行结果的协程函数（写操作统一经命令队列串行执行）
+_ROBOT_ACTIONS = {
+    "reset": lambda: plc_commands.pulse_db(2, 18),
+    "toggle": lambda: plc_commands.submit(robot_controller.toggle_robot),
+}
+
+
 @router.post("/robot/{action}", tags=["PLC"])
-def robot_act(action: Literal["reset", "toggle"]):
+async def robot_act(action: Literal["reset", "toggle"]):
     """控制 DB2 块中的机器人专用信号。
     在 action 参数中输入以下指令：
     reset: 对应 DB2.18.0 (机器人复位)。瞬动控制，用于清除机器人报警。
     toggle: 对应 DB2.18.4 (机器人启动/暂停)。反转控制，切换机器人的运行/暂停状态。"""
-
-    if action not in ["reset", "toggle"]:
-        raise HTTPException(status_code=400, detail=f"无效的机器人指令: {action}")
-
-    if not robot_controller.connect():
-        raise HTTPException(status_code=500, detail=f"机器人操作{action}失败: PLC未连接")
-
-    success = False
-    if action == "reset":
-        success = robot_controller.reset_robot()
-    elif action == "toggle":
-        success = robot_controller.toggle_robot()
-    else:
-        raise HTTPException(status_code=400, detail=f"无效的机器人指令: {action}")
-    logger.log(f"发送机器人指令: {action}", "INFO")
+    # action 的取值已由 Literal 校验（非法值返回422），这里直接查表分发
+    success = await _ROBOT_ACTIONS[action]()
+    plc_poller.invalidate()
+    logger.info("发送机器人指令: {}", action)
     if not success:
         raise HTTPException(status_code=500, detail=f"机器人指令{action}失败")
     return {"success": success}
\ No newline at end of file
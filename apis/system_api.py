@@ -1,14 +1,63 @@
-from fastapi import APIRouter
-from logger import sys_logger as logger
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import asyncio
+import orjson
+from logger import sys_logger as logger, LOG_BUFFER_SIZE
 
 router = APIRouter(prefix="/api/system", tags=["系统"])
 
 @router.get("/logs", tags=["系统"])
-def get_system_logs():
-    """获取最新日志"""
-    return {"logs": logger.logs}
+async def get_system_logs(request: Request,
+                          since: int = Query(default=0, ge=0, description="只返回序号大于该值的日志"),
+                          limit: int = Query(default=50, ge=1, le=5000, description="最多返回条数")):
+    """获取最新日志（最新的在前）
+    每条日志带有递增序号 seq，前端可将上次收到的最大 seq 作为 since 只拉取增量；
+    响应带 ETag，日志无变化时携带 If-None-Match 请求将返回 304"""
+    last_seq = logger.seq
+    etag = f'"{last_seq}-{since}-{limit}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(
+        {"logs": logger.get_logs(since, limit), "last_seq": last_seq},
+        headers={"ETag": etag}
+    )
+
+@router.get("/logs/stream", tags=["系统"])
+async def stream_system_logs(request: Request):
+    """以SSE(Server-Sent Events)推送新日志，每条事件的 id 为日志序号 seq。
+    断线重连时浏览器会携带 Last-Event-ID，服务端先补发此后的日志（旧的在前）再继续推送；
+    无新日志时每15秒发送一次注释行保活。"""
+    last_event_id = request.headers.get("last-event-id", "")
+    since = int(last_event_id) if last_event_id.isdigit() else None
+
+    def format_event(entry: dict) -> bytes:
+        return b"id: %d\ndata: %s\n\n" % (entry["seq"], orjson.dumps(entry))
+
+    async def event_source():
+        # 先订阅再补发，避免两者之间产生的日志丢失
+        queue = logger.subscribe()
+        try:
+            last_seq = 0
+            if since is not None:
+                for entry in reversed(logger.get_logs(since, LOG_BUFFER_SIZE)):
+                    last_seq = entry["seq"]
+                    yield format_event(entry)
+            while True:
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if entry["seq"] <= last_seq:
+                    continue  # 补发时已发送过
+                yield format_event(entry)
+        finally:
+            logger.unsubscribe(queue)
+
+    return StreamingResponse(event_source(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 @router.get("/health", tags=["系统"])
-def get_system_health():
+async def get_system_health():
     """获取系统健康状态"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
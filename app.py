@@ -1,4 +1,6 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from apis.centrifuge_api import router as centrifuge_router
 from apis.oven_api import router as oven_router
@@ -9,13 +11,37 @@ from apis.experiment_api import router as experiment_router
 from apis.system_api import router as system_router
 from apis.mixer_api import router as mixer_router
 from logger import sys_logger as logger
-import config
 from utils import initialize_oven_curve_db
 from devices.robot_core import robot_controller
 from devices.mixer_core import mixer_controller
 from devices.centrifuge_core import centrifuge_controller
 from devices.oven_core import oven_controller
 from devices.door_core import door_controller
+from devices.base import DeviceProtocol, DEVICE_POOL
+from services.plc import plc_poller, plc_commands
+from services.keepalive import device_keepalive
+
+# 需要在启动时连接、运行期间保活的设备: (设备名称, 控制器)
+DEVICES: list[tuple[str, DeviceProtocol]] = [
+    ("机器人", robot_controller),
+    ("配料设备", mixer_controller),
+    ("离心机", centrifuge_controller),
+    ("高温炉", oven_controller),
+    ("玻璃门", door_controller),
+]
+
+# 需要注册的路由
+ROUTERS: list[APIRouter] = [
+    centrifuge_router,
+    oven_router,
+    door_router,
+    plc_router,
+    flow_router,
+    experiment_router,
+    system_router,
+    mixer_router,
+]
+
 # ==========================================
 # 应用生命周期管理
 # ==========================================
@@ -23,40 +49,42 @@ from devices.door_core import door_controller
 async def lifespan(app: FastAPI):
     # Startup
     logger.log("系统服务启动...", "INFO")
-    if not robot_controller.connect():
-        logger.log(f"机器人连接失败: {robot_controller.get_message()}", "ERROR")
-    if not mixer_controller.connect():
-        logger.log(f"配料设备连接失败: {mixer_controller.get_message()}", "ERROR")
-    if not centrifuge_controller.connect():
-        logger.log(f"离心机连接失败: {centrifuge_controller.get_message()}", "ERROR")
-    if not oven_controller.connect():
-        logger.log(f"高温炉连接失败: {oven_controller.get_message()}", "ERROR")
-    if not door_controller.connect():
-        logger.log(f"玻璃门连接失败: {door_controller.get_message()}", "ERROR")
+    # 各设备连接互不依赖，并行连接，启动耗时取决于最慢的设备而不是总和
+    results = await asyncio.gather(*(asyncio.wrap_future(c.connect_async()) for _, c in DEVICES), return_exceptions=True)
+    for (name, controller), ok in zip(DEVICES, results):
+        if isinstance(ok, Exception):
+            logger.log(f"{name}连接异常: {str(ok)}", "ERROR")
+        elif not ok:
+            logger.log(f"{name}连接失败: {controller.get_message()}", "ERROR")
 
     initialize_oven_curve_db()
+    # 启动各设备连接保活（断线自动重连）及PLC状态后台轮询
+    device_keepalive.start(DEVICES)
+    plc_poller.start()
+    plc_commands.start()
     yield  # 运行应用程序
 
     # Shutdown
     logger.log("系统服务关闭...", "INFO")
+    await plc_commands.stop()
+    await plc_poller.stop()
+    await device_keepalive.stop()
+    # 并行断开各设备
+    await asyncio.gather(*(asyncio.wrap_future(c.disconnect_async()) for _, c in DEVICES), return_exceptions=True)
+    DEVICE_POOL.shutdown(wait=False)
 
 
 # ==========================================
 # 初始化全局对象
 # ==========================================
-app = FastAPI(title="AGV总控系统", version="10.4", lifespan=lifespan)
+# 默认使用orjson序列化响应，状态类接口返回的嵌套字典较大，序列化更快
+app = FastAPI(title="AGV总控系统", version="10.4", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # 注册各种路由
-app.include_router(centrifuge_router)
-app.include_router(oven_router)
-app.include_router(door_router)
-app.include_router(plc_router)
-app.include_router(flow_router)
-app.include_router(experiment_router)
-app.include_router(system_router)
-app.include_router(mixer_router)
+for router in ROUTERS:
+    app.include_router(router)
 
 # 根路径
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "AGV总控系统 API", "status": "running"}
\ No newline at end of file
@@ -1,55 +1,71 @@
 """
 配置文件
 从环境变量中加载配置，支持 .env 文件
+配置在首次调用 get_settings() 时解析一次并缓存，字段名对应的环境变量为其大写形式（如 plc_ip -> PLC_IP）
 """
-import os
-from pathlib import Path
-from dotenv import load_dotenv
-
-# 加载 .env 文件
-env_path = Path('.') / '.env'
-load_dotenv(dotenv_path=env_path)
-
-# ===================== 应用配置 =====================
-APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
-APP_PORT = int(os.getenv("APP_PORT", "8113"))
-APP_DEBUG = os.getenv("APP_DEBUG", "False").lower() == "true"
-
-# ===================== PLC 配置 =====================
-PLC_IP = os.getenv("PLC_IP", "192.168.0.205")
-PLC_PORT = int(os.getenv("PLC_PORT", "102"))
-
-# ===================== 离心机配置 =====================
-CENTRIFUGE_HOST = os.getenv("CENTRIFUGE_HOST", "192.168.0.140")
-CENTRIFUGE_PORT = int(os.getenv("CENTRIFUGE_PORT", "8000"))
-CENTRIFUGE_TIMEOUT = int(os.getenv("CENTRIFUGE_TIMEOUT", "5"))
-
-# ===================== 防护门配置 =====================
-DOOR_TARGET_ADDRESS = os.getenv("DOOR_TARGET_ADDRESS", "tcp://127.0.0.1:49202")
-
-# ===================== 高温炉配置 =====================
-FURNACE_REQ_ADDR = os.getenv("FURNACE_REQ_ADDR", "tcp://127.0.0.1:49206")
-FURNACE_SUB_ADDR = os.getenv("FURNACE_SUB_ADDR", "tcp://127.0.0.1:49200")
-FURNACE_CTRL_ADDR = os.getenv("FURNACE_CTRL_ADDR", "tcp://127.0.0.1:49201")
-
-# ===================== 高温炉曲线点地址配置 =====================
-FURNACE_DB_PATH=os.getenv("FURNACE_DB_PATH", "assets/oven_curve.sqlite")
-
-# ===================== 配料设备配置 =====================
-MIXER_API_BASE_URL = os.getenv("MIXER_API_BASE_URL", "http://127.0.0.1:4669")
-MIXER_USERNAME = os.getenv("MIXER_USERNAME", "admin")
-MIXER_PASSWORD = os.getenv("MIXER_PASSWORD", "admin")
-MIXER_TIMEOUT = int(os.getenv("MIXER_TIMEOUT", "30"))
-
-# ===================== XRD设备配置 =====================
-XRD_HOST = os.getenv("XRD_HOST", "192.168.8.127")
-XRD_PORT = int(os.getenv("XRD_PORT", "8009"))
-XRD_TIMEOUT = int(os.getenv("XRD_TIMEOUT", "5"))
-
-# ===================== 日志配置 =====================
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-LOG_FILE = os.getenv("LOG_FILE", "logs/app.log")
-
-# ===================== 其他配置 =====================
-# 可以添加其他配置项
-ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore', frozen=True)
+
+    # ===================== 应用配置 =====================
+    app_host: str = "0.0.0.0"
+    app_port: int = 8113
+    app_debug: bool = False
+    max_upload_size: int = 10 * 1024 * 1024  # 上传文件大小上限(字节)
+    # uvicorn 事件循环与HTTP解析器实现，auto 时已安装 uvloop/httptools（uvicorn[standard]）则优先使用
+    app_loop: str = "auto"   # auto / uvloop / asyncio
+    app_http: str = "auto"   # auto / httptools / h11
+    # uvicorn 工作进程数；每个进程各自持有设备连接与内存状态（试验任务、日志、PLC快照），
+    # 大于1时需确认PLC允许的并发S7会话数，且查询接口只能看到本进程内的任务
+    app_workers: int = 1
+
+    # ===================== PLC 配置 =====================
+    plc_ip: str = "192.168.0.205"
+    plc_port: int = 102
+    plc_poll_interval: float = 0.05  # 后台轮询PLC状态的间隔(秒)
+    plc_read_cache_ms: int = 50      # 单点读取(read_m/read_db_*)结果的缓存时间(毫秒)，0 表示不缓存
+
+    # ===================== 离心机配置 =====================
+    centrifuge_host: str = "192.168.0.140"
+    centrifuge_port: int = 8000
+    centrifuge_timeout: int = 5
+
+    # ===================== 防护门配置 =====================
+    door_target_address: str = "tcp://127.0.0.1:49202"
+
+    # ===================== 高温炉配置 =====================
+    furnace_req_addr: str = "tcp://127.0.0.1:49206"
+    furnace_sub_addr: str = "tcp://127.0.0.1:49200"
+    furnace_ctrl_addr: str = "tcp://127.0.0.1:49201"
+
+    # ===================== 高温炉曲线点地址配置 =====================
+    furnace_db_path: str = "assets/oven_curve.sqlite"
+
+    # ===================== 配料设备配置 =====================
+    mixer_api_base_url: str = "http://127.0.0.1:4669"
+    mixer_username: str = "admin"
+    mixer_password: str = "admin"
+    mixer_timeout: int = 30
+
+    # ===================== XRD设备配置 =====================
+    xrd_host: str = "192.168.8.127"
+    xrd_port: int = 8009
+    xrd_timeout: int = 5
+
+    # ===================== 日志配置 =====================
+    log_level: str = "INFO"
+    log_buffer_level: str = "DEBUG"  # 进入前端日志缓冲区/推送的最低级别，与控制台/文件的 log_level 分开配置
+    log_file: str = "logs/app.log"
+
+    # ===================== 其他配置 =====================
+    # 可以添加其他配置项
+    environment: str = "development"
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """获取全局配置（只解析一次）"""
+    return Settings()
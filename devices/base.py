@@ -1,37 +1,172 @@
-from abc import ABC, abstractmethod
+import ctypes
+import heapq
+import struct
+import threading
+import socket
 import requests
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 import time
-from enum import Enum
+from enum import IntEnum
+from typing import Protocol
+
+from logger import sys_logger as logger
 
 # PLC通信库（snap7）
 try:
     from snap7 import client
-    from snap7.type import Area
+    from snap7.type import Area, WordLen, S7DataItem, Parameter
     SNAP7_AVAILABLE = True
 except ImportError:
     client = None
     Area = None
+    WordLen = None
+    S7DataItem = None
+    Parameter = None
     SNAP7_AVAILABLE = False
 
-class DeviceStatus(Enum):
-    idle = "就绪"
-    connected = "已连接"
-    disconnected = "未连接"
-    started = "已启动"
-    running = "运行中"
-    paused = "暂停"
-    cancelled = "已取消"
-    completed = "已完成"
-    stopped = "已停止"
-    error = "错误"
-    timeout = "超时"
-    abnormal = "异常"
-    unknown = "未知"
+# snap7 通信错误（python-snap7 以 RuntimeError 报告S7错误，网络层为 OSError；
+# 并发断开时 client 可能已被置为 None，表现为 AttributeError）
+PLC_ERRORS = (RuntimeError, OSError, AttributeError)
+# 通信失败或连接尝试后的重连冷却时间(秒)
+RECONNECT_COOLDOWN = 3.0
+
+# snap7 客户端超时(毫秒)：连接前的探测、接收；默认值(750/3000)下PLC掉线时单次读写最长要等3秒
+# （snap7 自身已对套接字设置 TCP_NODELAY，无需再处理Nagle）
+PLC_PING_TIMEOUT_MS = 500
+PLC_RECV_TIMEOUT_MS = 500
+
+# read_multi 单次S7请求的限制：snap7 每次最多20个变量；数据量按240字节PDU保守估计
+MULTI_READ_MAX_ITEMS = 20
+MULTI_READ_MAX_BYTES = 200
+
+# 点动信号保持时间(秒)
+PULSE_SECONDS = 0.5
+# M区字节本地缓存的有效期(秒)，超过该时间翻转前重新读取PLC
+M_CACHE_MAX_AGE = 0.5
+# read_m / read_db_* 读取结果的默认缓存时间(毫秒)，0 表示不缓存
+READ_CACHE_MS = 50
+# read_db_int 常用长度的预编译解码器（大端无符号）
+_DB_INT_STRUCTS = {1: struct.Struct('>B'), 2: struct.Struct('>H'), 4: struct.Struct('>I')}
+# 字节 -> 8个位状态(低位在前)的查找表，解码一个字节只需一次索引
+BYTE_BITS = tuple(tuple(bool((b >> i) & 1) for i in range(8)) for b in range(256))
+
+
+class PulseScheduler:
+    """
+    点动复位定时器
+    所有点动信号的复位操作共用一个后台线程按到期时间执行，置位后调用方立即返回，
+    N 个并发点动的总耗时约为一个保持时间，而不是 N 倍
+    """
+    def __init__(self):
+        self._heap = []        # (到期时间, 序号, key)
+        self._pending = {}     # key -> (到期时间, 复位回调)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, key, delay: float, callback):
+        """在 delay 秒后执行 callback；同一 key 重复点动时以最后一次为准（延后复位）"""
+        with self._cond:
+            deadline = time.monotonic() + delay
+            self._seq += 1
+            self._pending[key] = (deadline, callback)
+            heapq.heappush(self._heap, (deadline, self._seq, key))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="pulse-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    deadline, _, key = self._heap[0]
+                    pending = self._pending.get(key)
+                    # 已被更新的旧条目直接丢弃
+                    if pending is None or pending[0] != deadline:
+                        heapq.heappop(self._heap)
+                        continue
+                    wait = deadline - time.monotonic()
+                    if wait > 0:
+                        self._cond.wait(wait)
+                        continue
+                    heapq.heappop(self._heap)
+                    del self._pending[key]
+                    callback = pending[1]
+                    break
+            try:
+                callback()
+            except Exception as e:
+                logger.error("点动复位回调异常: {}", e)
+
+
+pulse_scheduler = PulseScheduler()
+
+# 设备阻塞I/O（连接、断开等）专用线程池，与接口层的线程池隔离，多个设备的操作可以并行执行；
+# 同一设备的调用仍由各设备自身的锁串行化
+DEVICE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dev")
+
+
+class DeviceStatus(IntEnum):
+    """设备状态
+    取值为整数，比较与字典查找走int快速路径；中文名称通过 label 从 _STATUS_LABELS 按下标取得
+    """
+    idle = 0
+    connected = 1
+    disconnected = 2
+    started = 3
+    running = 4
+    paused = 5
+    cancelled = 6
+    completed = 7
+    stopped = 8
+    error = 9
+    timeout = 10
+    abnormal = 11
+    unknown = 12
+
+    @property
+    def label(self) -> str:
+        """状态的中文名称"""
+        return _STATUS_LABELS[self]
+
+
+# DeviceStatus 各取值对应的中文名称，下标即枚举值
+_STATUS_LABELS = ("就绪", "已连接", "未连接", "已启动", "运行中", "暂停", "已取消",
+                  "已完成", "已停止", "错误", "超时", "异常", "未知")
 
 # ===================== 1. 设备基类（所有设备的通用接口） =====================
-class BaseDevice(ABC):
-    """设备抽象基类：定义所有设备必须实现的核心接口"""
+class DeviceProtocol(Protocol):
+    """设备接口协议：所有设备必须实现的核心接口（用于类型标注）"""
+    device_name: str
+    is_connected: bool
+
+    def connect(self) -> bool: ...
+    def disconnect(self): ...
+    def connect_async(self) -> Future: ...
+    def disconnect_async(self) -> Future: ...
+    def start(self): ...
+    def stop(self): ...
+    def get_status(self) -> dict: ...
+    def get_result(self) -> dict: ...
+    def get_message(self) -> str: ...
+
+
+class BaseDevice:
+    """设备基类：保存所有设备的通用属性，核心接口由子类实现（见 DeviceProtocol）
+    通用属性使用 __slots__ 存储，状态查询等高频路径的属性读取不经过实例字典；
+    各具体控制器同样声明 __slots__（实例没有 __dict__），新增实例属性时需同步加入所在类的 __slots__
+    """
+    __slots__ = ('device_name', 'control_type', 'device_id', 'is_connected', 'result', 'message', 'status',
+                 '_log_prefix')
+
     def __init__(self, device_name: str, control_type: str, device_id: str):
         # 通用属性：设备名称、控制方式、唯一编号
         self.device_name = device_name  # 如 "plc_robot_arm_01"
@@ -41,51 +176,75 @@ class BaseDevice(ABC):
         self.result = None                    # 设备结果
         self.message = None                   # 设备消息
         self.status = DeviceStatus.unknown    # 设备状态: 默认未知
+        self._log_prefix = f"[{device_name}] "  # 日志前缀，只在初始化时拼接一次
 
-    @abstractmethod
     def connect(self):
         """连接设备（子类必须实现）"""
-        pass
+        raise NotImplementedError
+
+    def connect_async(self) -> Future:
+        """在 DEVICE_POOL 中执行 connect，立即返回 Future"""
+        return DEVICE_POOL.submit(self.connect)
+
+    def disconnect_async(self) -> Future:
+        """在 DEVICE_POOL 中执行 disconnect，立即返回 Future"""
+        return DEVICE_POOL.submit(self.disconnect)
 
-    @abstractmethod
     def disconnect(self):
         """断开设备（子类必须实现）"""
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def start(self):
         """启动设备（子类必须实现）"""
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def stop(self):
         """停止设备（子类必须实现）"""
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def get_status(self) -> dict:
         """获取设备状态（子类必须实现），返回状态字典"""
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def get_result(self) -> dict:
         """获取设备结果（子类必须实现），返回结果字典"""
-        pass
+        raise NotImplementedError
 
-    @abstractmethod
     def get_message(self) -> str:
-        """获取设备消息（子类必须实现），返回消息字符串"""
-        pass
+        """获取设备消息，返回消息字符串（子类可重写）"""
+        return self.message or ""
 
 # ===================== 2. 控制方式中间类（封装通用控制逻辑） =====================
 class PLCControlledDevice(BaseDevice):
     """PLC控制设备的通用逻辑（基于snap7库）"""
+    __slots__ = ('plc_ip', 'plc_port', 'client', '_cooldown_until', '_multi_read_templates', '_io_lock',
+                 '_m_cache', '_m_write_time', '_m_cache_lock', 'read_cache_ms', '_read_cache', '_read_cache_lock',
+                 '_read_cache_gen',
+                 '_status_static', '_pending_resets')
+
     def __init__(self, device_name: str, device_id: str, plc_ip: str, plc_port: int = 102):
         super().__init__(device_name, "PLC", device_id)
         self.plc_ip = plc_ip
         self.plc_port = plc_port
         self.client = None  # snap7客户端对象
-        self.last_conn = 0  # 上次连接尝试时间（用于限制重连频率）
+        self._cooldown_until = 0.0  # 冷却截止时刻(monotonic)，在此之前不尝试重连（限制重连频率）
+        # snap7 Client 非线程安全，所有对 self.client 的调用都在该锁内进行（可重入）
+        self._io_lock = threading.RLock()
+        # read_multi 的请求模板缓存: specs -> (S7DataItem数组, 数据缓冲区列表)
+        self._multi_read_templates = {}
+        # M区字节的本地缓存(写直达): b -> (字节值, 读取时刻)，toggle_m 在缓存有效时无需先读PLC
+        self._m_cache = {}
+        self._m_write_time = {}  # b -> 最近一次写入时刻，防止旧读数覆盖刚写入的值
+        self._m_cache_lock = threading.RLock()
+        # 单点读取的短时缓存: (area, db, start, size) -> (读取时刻, 数据)，高频轮询同一地址时不重复请求PLC
+        self.read_cache_ms = READ_CACHE_MS
+        self._read_cache = {}
+        self._read_cache_lock = threading.Lock()
+        self._read_cache_gen = 0  # 写入代次：每次写入后推进，读取期间代次变化则不缓存该读数
+        # get_status 中不会变化的字段，初始化时生成一次
+        self._status_static = {"name": device_name, "ip": plc_ip, "port": plc_port}
+        # 复位失败的点动信号: key -> 复位函数，重连成功后补发，避免信号一直保持为1
+        self._pending_resets = {}
 
     def try_connect(self):
         """尝试连接PLC（带重连频率限制）"""
@@ -93,72 +252,123 @@ class PLCControlledDevice(BaseDevice):
         if self.is_connected and self.client:
             return True
 
-        # 限制重连频率，防止报错刷屏 (3秒一次)
-        if time.time() - self.last_conn < 3:
-            return False
-        self.last_conn = time.time()
-
-        # === 核心逻辑: 每次重连必须重建对象 ===
-        # 1. 彻底清理旧对象
-        if self.client:
-            try:
-                self.client.disconnect()
-                self.client.destroy()
-            except:
-                pass
-            self.client = None
+        with self._io_lock:
+            # 等锁期间其他线程可能已完成重连，避免重复建立连接
+            if self.is_connected and self.client:
+                return True
 
-        # 2. 创建全新实例并尝试连接
-        if not SNAP7_AVAILABLE:
-            self.is_connected = False
-            self.message = "snap7库未安装"
-            return False
+            # 限制重连频率，防止报错刷屏 (3秒一次)；通信失败后的冷却期内同样不重连
+            now = time.monotonic()
+            if now < self._cooldown_until:
+                return False
+            self._cooldown_until = now + RECONNECT_COOLDOWN
 
-        try:
-            self.client = client.Client()
-            self.client.connect(self.plc_ip, 0, 1, self.plc_port)
-            self.is_connected = self.client.get_connected()
-            if self.is_connected:
-                self.message = f"PLC设备连接成功: {self.plc_ip}:{self.plc_port}"
-                return True
-            else:
-                self.message = "PLC连接失败：无法建立连接"
+            # === 核心逻辑: 每次重连必须重建对象 ===
+            # 1. 彻底清理旧对象
+            if self.client:
+                try:
+                    self.client.disconnect()
+                    self.client.destroy()
+                except PLC_ERRORS:
+                    pass
+                self.client = None
+
+            # 2. 创建全新实例并尝试连接
+            if not SNAP7_AVAILABLE:
+                self.is_connected = False
+                self.message = "snap7库未安装"
                 return False
-        except Exception as e:
-            self.is_connected = False
-            self.message = f"PLC设备连接失败: {str(e)}"
+
             try:
-                if self.client:
-                    self.client.destroy()
-            except:
-                pass
-            self.client = None
-            return False
+                self.client = client.Client()
+                self.client.set_param(Parameter.PingTimeout, PLC_PING_TIMEOUT_MS)
+                self.client.set_param(Parameter.RecvTimeout, PLC_RECV_TIMEOUT_MS)
+                self.client.connect(self.plc_ip, 0, 1, self.plc_port)
+                self.is_connected = self.client.get_connected()
+                if self.is_connected:
+                    self.message = f"PLC设备连接成功: {self.plc_ip}:{self.plc_port}"
+                    self._replay_pulse_resets()
+                    return self.is_connected
+                else:
+                    self.message = "PLC连接失败：无法建立连接"
+                    return False
+            except Exception as e:
+                self.is_connected = False
+                self.message = f"PLC设备连接失败: {str(e)}"
+                try:
+                    if self.client:
+                        self.client.destroy()
+                except PLC_ERRORS:
+                    pass
+                self.client = None
+                return False
 
     def connect(self):
         """连接PLC设备（实现抽象方法）"""
         return self.try_connect()
 
+    def _mark_failed(self):
+        """通信失败：标记断开并进入冷却期，冷却期内的读写直接返回，不再发起注定失败的请求"""
+        self.is_connected = False
+        self._cooldown_until = time.monotonic() + RECONNECT_COOLDOWN
+
+    def _ensure_connected(self) -> bool:
+        """已连接时只做一次布尔判断，未连接时才进入 try_connect"""
+        return (self.is_connected and self.client is not None) or self.try_connect()
+
     def disconnect(self):
         """断开PLC设备连接"""
-        if self.client:
-            try:
-                self.client.disconnect()
-                self.client.destroy()
-            except:
-                pass
-            self.client = None
-        self.is_connected = False
+        with self._io_lock:
+            if self.client:
+                try:
+                    self.client.disconnect()
+                    self.client.destroy()
+                except PLC_ERRORS:
+                    pass
+                self.client = None
+            self.is_connected = False
+            with self._read_cache_lock:
+                self._read_cache.clear()
+                self._read_cache_gen += 1
         self.message = "PLC设备已断开连接"
 
+    def _cached_read(self, area, db, start, size, copy: bool = True):
+        """带短时缓存的读取，缓存未过期时直接返回上次的数据，异常由调用方处理
+        读取期间若有写入（写入代次变化），本次读数可能早于写入，只返回不缓存
+        :param copy: 为False时命中缓存直接返回缓存中的只读bytes，供只解码不修改的调用方使用，避免复制
+        """
+        key = (area, db, start, size)
+        now = time.monotonic()
+        cached = self._read_cache.get(key)
+        if cached is not None and now - cached[0] < self.read_cache_ms / 1000:
+            return bytearray(cached[1]) if copy else cached[1]
+        with self._io_lock:
+            gen = self._read_cache_gen
+            data = self.client.read_area(area, db, start, size)
+        with self._read_cache_lock:
+            if self._read_cache_gen == gen:
+                self._read_cache[key] = (now, bytes(data))
+        return data
+
+    def _invalidate_reads(self, area, db, start, size=1):
+        """丢弃与写入范围 [start, start+size) 重叠的读取缓存，并推进写入代次
+        须在持有 _io_lock、写入请求发出之后调用，保证与之并发的读取不会把旧值存回缓存
+        """
+        end = start + size
+        with self._read_cache_lock:
+            self._read_cache_gen += 1
+            for key in [k for k in self._read_cache
+                        if k[0] == area and k[1] == db and k[2] < end and start < k[2] + k[3]]:
+                del self._read_cache[key]
+
     def read_m(self, b, i):
         """读取M区位状态"""
         if not self.is_connected or not self.client:
             return False
         try:
-            return bool((self.client.read_area(Area.MK, 0, b, 1)[0] >> i) & 1)
-        except:
-            self.is_connected = False
+            return BYTE_BITS[self._cached_read(Area.MK, 0, b, 1, copy=False)[0]][i]
+        except PLC_ERRORS:
+            self._mark_failed()
             return False
 
     def read_m_bytes(self, b)->bytearray:
@@ -166,102 +376,233 @@ class PLCControlledDevice(BaseDevice):
         if not self.is_connected or not self.client:
             return bytearray()
         try:
-            return self.client.read_area(Area.MK, 0, b, 1)
-        except:
-            self.is_connected = False
+            return self._cached_read(Area.MK, 0, b, 1)
+        except PLC_ERRORS:
+            self._mark_failed()
             return bytearray()
 
+    def read_m_bits(self, b, n) -> list[bool]:
+        """从M区字节b起连续读取n个位（Mb.0, Mb.1, ..., 低位在前），一次请求读取 ceil(n/8) 个字节
+        :return: 长度为n的位状态列表；读取失败返回空列表
+        """
+        if not self.is_connected or not self.client:
+            return []
+        try:
+            data = self._cached_read(Area.MK, 0, b, (n + 7) // 8, copy=False)
+        except PLC_ERRORS:
+            self._mark_failed()
+            return []
+        bits = [bit for byte in data for bit in BYTE_BITS[byte]]
+        del bits[n:]
+        return bits
+
+    def write_m_bits(self, b, bits) -> bool:
+        """从M区字节b起连续写入位（低位在前），一次请求写入 ceil(n/8) 个字节
+        位数不是8的整数倍时，末字节中超出部分的位保持PLC中的原值
+        """
+        n = len(bits)
+        if n == 0:
+            return True
+        data = bytearray((n + 7) // 8)
+        for k, bit in enumerate(bits):
+            if bit:
+                data[k >> 3] |= 1 << (k & 7)
+        if not self.is_connected or not self.client:
+            return False
+        with self._io_lock:
+            if n & 7:
+                try:
+                    last = b + len(data) - 1
+                    keep = self.client.read_area(Area.MK, 0, last, 1)[0] & ~((1 << (n & 7)) - 1) & 0xFF
+                except PLC_ERRORS:
+                    self._mark_failed()
+                    return False
+                data[-1] |= keep
+            return self.write_m_bytes(b, data)
+
     def write_m_bytes(self, b:int, v:bytearray)->bool:
         """写入M区字节数据"""
         if not self.is_connected or not self.client:
             return False
+        for k in range(b, b + len(v)):
+            self._m_cache.pop(k, None)
         try:
-            self.client.write_area(Area.MK, 0, b, v)
+            with self._io_lock:
+                try:
+                    self.client.write_area(Area.MK, 0, b, v)
+                finally:
+                    self._invalidate_reads(Area.MK, 0, b, len(v))
             return True
-        except:
-            self.is_connected = False
+        except PLC_ERRORS:
+            self._mark_failed()
             return False
 
     def toggle_m(self, b, i):
-        """切换M区位状态: 0->1 或 1->0 (保持模式)"""
-        if not self.connect():
+        """切换M区位状态: 0->1 或 1->0 (保持模式)
+        当前值优先取本地缓存，只发送一次按位写入；缓存缺失或过期时才先读取PLC
+        """
+        if not self._ensure_connected():
             return False
         try:
-            d = self.client.read_area(Area.MK, 0, b, 1)
-            v = bytearray(d)
-            if (v[0] >> i) & 1:
-                v[0] &= ~(1 << i)
-            else:
-                v[0] |= (1 << i)
-            self.client.write_area(Area.MK, 0, b, v)
+            with self._m_cache_lock:
+                cached = self._m_cache.get(b)
+                if cached is None or time.monotonic() - cached[1] > M_CACHE_MAX_AGE:
+                    with self._io_lock:
+                        current = self.client.read_area(Area.MK, 0, b, 1)[0]
+                    self._m_cache[b] = (current, time.monotonic())
+                else:
+                    current = cached[0]
+                self._write_m_bit(b, i, not ((current >> i) & 1))
             return True
-        except Exception as e:
-            self.is_connected = False
+        except PLC_ERRORS:
+            self._m_cache.pop(b, None)
+            self._mark_failed()
             return False
 
+    def update_m_cache(self, b, value: int, read_time: float):
+        """用批量读取到的M区字节刷新本地缓存（如后台状态轮询）
+        只接受读取开始时刻晚于最近一次写入的读数
+        """
+        with self._m_cache_lock:
+            if read_time >= self._m_write_time.get(b, 0.0):
+                self._m_cache[b] = (value, read_time)
+
     def pulse_m(self, b, i):
-        """M区点动控制: 置位1 -> 等待0.5s -> 复位0 (安全模式)"""
-        if not self.connect():
+        """M区点动控制: 置位1 -> 0.5s后复位0 (安全模式)
+        置位后立即返回，复位由 pulse_scheduler 在后台定时执行，不阻塞调用方
+        """
+        if not self.set_m(b, i, True):
             return False
+        key = (id(self), "M", b, i)
+        self._pending_resets.pop(key, None)
+        pulse_scheduler.schedule(key, PULSE_SECONDS, lambda: self._run_pulse_reset(key, lambda: self.set_m(b, i, False)))
+        return True
 
+    def pulse_db(self, db, byte):
+        """DB区点动控制: 置位1 -> 0.5s后复位0 (安全模式)
+        置位后立即返回，复位由 pulse_scheduler 在后台定时执行，不阻塞调用方
+        """
+        if not self.write_db_int(db, byte, 1):
+            return False
+        key = (id(self), "DB", db, byte)
+        self._pending_resets.pop(key, None)
+        pulse_scheduler.schedule(key, PULSE_SECONDS,
+                                 lambda: self._run_pulse_reset(key, lambda: self.write_db_int(db, byte, 0)))
+        return True
+
+    def _run_pulse_reset(self, key, reset) -> bool:
+        """执行点动复位；失败时记录日志、标记通信失败，并登记到重连后补发
+        :param reset: 复位函数，返回是否写入成功
+        """
         try:
-            # 1. 置位 (ON)
-            d = self.client.read_area(Area.MK, 0, b, 1)
-            v = bytearray(d)
-            v[0] |= (1 << i)
-            self.client.write_area(Area.MK, 0, b, v)
-
-            # 2. 延时
-            time.sleep(0.5)
-
-            # 3. 复位 (OFF)
-            d = self.client.read_area(Area.MK, 0, b, 1)
-            v = bytearray(d)
-            v[0] &= ~(1 << i)
-            self.client.write_area(Area.MK, 0, b, v)
-            return True
+            ok = reset()
         except Exception as e:
-            self.is_connected = False
-            return False
-
-    def pulse_db(self, db, byte):
-        """DB区点动控制: 置位1 -> 等待0.5s -> 复位0 (安全模式)"""
-        if not self.connect():
+            logger.error("{}点动复位异常 {}: {}", self._log_prefix, key[1:], e)
+            ok = False
+        if ok:
+            return True
+        logger.error("{}点动复位失败 {}，信号可能仍保持为1，重连后将重试复位", self._log_prefix, key[1:])
+        self._pending_resets[key] = reset
+        self._mark_failed()
+        return False
+
+    def _replay_pulse_resets(self):
+        """重连成功后补发之前失败的点动复位"""
+        if not self._pending_resets:
+            return
+        pending, self._pending_resets = self._pending_resets, {}
+        for key, reset in pending.items():
+            if self._run_pulse_reset(key, reset):
+                logger.info("{}重连后已补发点动复位 {}", self._log_prefix, key[1:])
+
+    def _write_bit(self, area, db, byte, bit, value: bool):
+        """按位写入单个位（WordLen.Bit，一次S7请求，不读取、不影响同字节的其他位），异常由调用方处理"""
+        buffer = (ctypes.c_uint8 * 1)(1 if value else 0)
+        items = (S7DataItem * 1)()
+        item = items[0]
+        item.Area = int(area)
+        item.WordLen = int(WordLen.Bit)
+        item.Result = 0
+        item.DBNumber = db
+        item.Start = byte * 8 + bit
+        item.Amount = 1
+        item.pData = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_uint8))
+        with self._io_lock:
+            # 直接对已构建的数组调用 Cli_WriteMultiVars：client.write_multi_vars 会复制数据项，
+            # 取不到各项自身的 Result，PLC拒绝写入（地址错误、DB不存在、无权限）时也会被当作成功。
+            # _lib/_s7_client 为 python-snap7 2.0.2 的内部属性（requirements.txt 固定该版本，tests/test_snap7_binding.py 检查）
+            try:
+                lib = getattr(self.client, "_lib", None)
+                handle = getattr(self.client, "_s7_client", None)
+                if lib is not None and handle is not None:
+                    code = lib.Cli_WriteMultiVars(handle, ctypes.byref(items), ctypes.c_int32(1))
+                else:
+                    # 其他版本取不到内部句柄时退回公开接口，只能检查整次请求的返回码（失败时抛RuntimeError）
+                    code = self.client.write_multi_vars([item])
+            finally:
+                self._invalidate_reads(area, db, byte)
+        if code != 0 or item.Result != 0:
+            raise RuntimeError(f"S7按位写入失败: area=0x{int(area):02X} DB{db} {byte}.{bit} "
+                               f"(返回码 0x{code:X}, 数据项结果 0x{item.Result:X})")
+
+    def _write_m_bit(self, b, i, value: bool):
+        """写M区单个位并同步本地缓存，异常由调用方处理"""
+        with self._m_cache_lock:
+            try:
+                self._write_bit(Area.MK, 0, b, i, value)
+            except Exception:
+                self._m_cache.pop(b, None)
+                raise
+            now = time.monotonic()
+            self._m_write_time[b] = now
+            cached = self._m_cache.get(b)
+            if cached is not None:
+                v = cached[0] | (1 << i) if value else cached[0] & ~(1 << i)
+                self._m_cache[b] = (v, cached[1])
+
+    def set_m(self, b, i, value: bool) -> bool:
+        """置位/复位M区单个位（按位写入，一次S7请求）"""
+        if not self._ensure_connected():
             return False
         try:
-            # 1. 置位 (ON)
-            self.client.write_area(Area.DB, db, byte, b'\x01')
-
-            # 2. 延时
-            time.sleep(0.5)
-
-            # 3. 复位 (OFF)
-            self.client.write_area(Area.DB, db, byte, b'\x00')
+            self._write_m_bit(b, i, value)
             return True
-        except Exception as e:
-            self.is_connected = False
+        except PLC_ERRORS:
+            self._mark_failed()
             return False
 
     def write_db_int(self, db, byte, value, size=1):
         """写入DB区数据"""
-        if not self.connect():
+        if not self._ensure_connected():
             return False
         try:
-            self.client.write_area(Area.DB, db, byte, int(value).to_bytes(size, 'big'))
+            data = int(value).to_bytes(size, 'big')
+        except (OverflowError, TypeError, ValueError):
+            return False
+        try:
+            with self._io_lock:
+                try:
+                    self.client.write_area(Area.DB, db, byte, data)
+                finally:
+                    self._invalidate_reads(Area.DB, db, byte, size)
             return True
-        except Exception as e:
-            self.is_connected = False
+        except PLC_ERRORS:
+            self._mark_failed()
             return False
 
     def write_db_bytes(self, db, byte, value: bytearray):
         """写入DB区字节数据, value为bytearray类型"""
-        if not self.connect():
+        if not self._ensure_connected():
             return False
         try:
-            self.client.write_area(Area.DB, db, byte, value)
+            with self._io_lock:
+                try:
+                    self.client.write_area(Area.DB, db, byte, value)
+                finally:
+                    self._invalidate_reads(Area.DB, db, byte, len(value))
             return True
-        except Exception as e:
-            self.is_connected = False
+        except PLC_ERRORS:
+            self._mark_failed()
             return False
 
     def read_db_bit(self, db, byte, bit):
@@ -269,33 +610,119 @@ class PLCControlledDevice(BaseDevice):
         if not self.is_connected or not self.client:
             return False
         try:
-            d = self.client.read_area(Area.DB, db, byte, 1)
-            return bool((d[0] >> bit) & 1)
-        except:
-            self.is_connected = False
+            return BYTE_BITS[self._cached_read(Area.DB, db, byte, 1, copy=False)[0]][bit]
+        except PLC_ERRORS:
+            self._mark_failed()
             return False
 
+    def read_db_bits(self, db, byte, n) -> int:
+        """从DB区字节byte起连续读取n个位，一次请求读取 ceil(n/8) 个字节，按位打包成整数返回
+        第k位(DB{db}.{byte + k // 8}.{k % 8})对应返回值的 (w >> k) & 1，例如:
+            w = dev.read_db_bits(3, 0, 32); running = w & 1; error = (w >> 3) & 1
+            置位个数: w.bit_count()
+        :return: 位状态打包的整数；读取失败返回0
+        """
+        if not self.is_connected or not self.client:
+            return 0
+        try:
+            data = self._cached_read(Area.DB, db, byte, (n + 7) // 8, copy=False)
+        except PLC_ERRORS:
+            self._mark_failed()
+            return 0
+        return int.from_bytes(data, 'little') & ((1 << n) - 1)
+
     def read_db_int(self, db, byte, size=2):
         """读取DB区整数值"""
         if not self.is_connected or not self.client:
             return 0
         try:
-            d = self.client.read_area(Area.DB, db, byte, size)
-            return int.from_bytes(d, 'big')
-        except:
-            self.is_connected = False
+            d = self._cached_read(Area.DB, db, byte, size, copy=False)
+            decoder = _DB_INT_STRUCTS.get(size)
+            return decoder.unpack_from(d)[0] if decoder else int.from_bytes(d, 'big')
+        except PLC_ERRORS:
+            self._mark_failed()
             return 0
 
     def read_db_bytes(self, db, byte, size)->bytearray:
         if not self.is_connected or not self.client:
             return bytearray()
         try:
-            d = self.client.read_area(Area.DB, db, byte, size)
+            d = self._cached_read(Area.DB, db, byte, size)
             return d
-        except:
-            self.is_connected = False
+        except PLC_ERRORS:
+            self._mark_failed()
             return bytearray()
 
+    @staticmethod
+    def _split_multi_read(specs):
+        """按S7 PDU限制把specs分组：每组不超过 MULTI_READ_MAX_ITEMS 项、数据合计不超过 MULTI_READ_MAX_BYTES"""
+        groups, group, total = [], [], 0
+        for spec in specs:
+            # 每项应答带4字节头，数据按偶数字节对齐
+            cost = 4 + spec[3] + (spec[3] & 1)
+            if group and (len(group) >= MULTI_READ_MAX_ITEMS or total + cost > MULTI_READ_MAX_BYTES):
+                groups.append(group)
+                group, total = [], 0
+            group.append(spec)
+            total += cost
+        if group:
+            groups.append(group)
+        return groups
+
+    @staticmethod
+    def _build_multi_read_template(specs):
+        """根据specs构建 read_multi_vars 所需的S7DataItem数组及各自的数据缓冲区
+        :return: [(specs分组, S7DataItem数组, 数据缓冲区列表), ...]，每组对应一次S7请求
+        """
+        template = []
+        for group in PLCControlledDevice._split_multi_read(specs):
+            items = (S7DataItem * len(group))()
+            buffers = []
+            for item, (area, db, start, size) in zip(items, group):
+                buffer = (ctypes.c_uint8 * size)()
+                item.Area = int(area)
+                item.WordLen = int(WordLen.Byte)
+                item.Result = 0
+                item.DBNumber = db
+                item.Start = start
+                item.Amount = size
+                item.pData = ctypes.cast(buffer, ctypes.POINTER(ctypes.c_uint8))
+                buffers.append(buffer)
+            template.append((group, items, buffers))
+        return template
+
+    def read_multi(self, specs) -> list[bytearray] | None:
+        """批量读取多个区域，每个分组合并在一次S7请求(read_multi_vars)中完成
+        区域数量或数据量超过一个PDU时自动拆分为多次请求
+        :param specs: ((area, db, start, size), ...)，M区的db填0；需为元组，同时作为请求模板的缓存键
+        :return: 与specs一一对应的bytearray列表；读取失败返回None
+        """
+        if not self.is_connected or not self.client:
+            return None
+
+        # 模板与缓冲区按specs缓存复用，在IO锁内使用，并发调用不会共用同一缓冲区
+        with self._io_lock:
+            template = self._multi_read_templates.get(specs)
+            if template is None:
+                template = self._multi_read_templates[specs] = self._build_multi_read_template(specs)
+            result = []
+            for group, items, buffers in template:
+                try:
+                    self.client.read_multi_vars(items)
+                    if all(item.Result == 0 for item in items):
+                        result.extend(bytearray(buffer) for buffer in buffers)
+                        continue
+                except PLC_ERRORS:
+                    pass
+
+                # 该组批量读取失败时退回逐个读取
+                try:
+                    result.extend(self.client.read_area(area, db, start, size) for area, db, start, size in group)
+                except PLC_ERRORS:
+                    self._mark_failed()
+                    return None
+            return result
+
     def start(self):
         """启动设备（PLC设备通常通过任务控制，此方法可被子类重写）"""
         if self.is_connected:
@@ -311,20 +738,19 @@ class PLCControlledDevice(BaseDevice):
         self.result = {"status": "success", "message": "PLC设备已停止"}
 
     def get_status(self) -> dict:
-        """获取设备状态"""
-        return {
-            "name": self.device_name,
-            "connected": self.is_connected,
-            "ip": self.plc_ip,
-            "port": self.plc_port,
-            "message": self.message,
-            "status": self.status
-        }
+        """获取设备状态
+        每次返回新字典（状态轮询按对象比较变化并保存快照），只更新可变字段
+        """
+        status = self._status_static.copy()
+        status["connected"] = self.is_connected
+        status["message"] = self.message
+        status["status"] = self.status.label
+        return status
 
     def get_result(self) -> dict:
         """获取设备结果"""
         return self.result if self.result else {
-            "status": self.status,
+            "status": self.status.label,
             "message": self.message
         }
 
@@ -334,6 +760,8 @@ class PLCControlledDevice(BaseDevice):
 
 class ModbusControlledDevice(BaseDevice):
     """Modbus控制设备的通用逻辑"""
+    __slots__ = ('modbus_addr', 'modbus_port', 'modbus_client')
+
     def __init__(self, device_name: str, device_id: str, modbus_addr: int, modbus_port: int):
         super().__init__(device_name, "Modbus", device_id)
         self.modbus_addr = modbus_addr
@@ -348,9 +776,9 @@ class ModbusControlledDevice(BaseDevice):
             # self.modbus_client = ModbusTcpClient('localhost', port=self.modbus_port)
             # self.modbus_client.connect()
             self.is_connected = True
-            print(f"[{self.device_name}] Modbus设备连接成功")
+            logger.info("{}Modbus设备连接成功", self._log_prefix)
         except Exception as e:
-            print(f"[{self.device_name}] Modbus设备连接失败：{e}")
+            logger.error("{}Modbus设备连接失败：{}", self._log_prefix, e)
             self.is_connected = False
 
     def disconnect(self):
@@ -358,10 +786,12 @@ class ModbusControlledDevice(BaseDevice):
         if self.is_connected and self.modbus_client:
             # self.modbus_client.close()
             self.is_connected = False
-            print(f"[{self.device_name}] Modbus设备断开连接")
+            logger.info("{}Modbus设备断开连接", self._log_prefix)
 
 class SocketControlledDevice(BaseDevice):
     """Socket/ZMQ控制设备的通用逻辑"""
+    __slots__ = ('socket_address', 'context', 'socket', '_socket_type', '_socket_timeout')
+
     def __init__(self, device_name: str, device_id: str, socket_address: str):
         super().__init__(device_name, "Socket", device_id)
         self.socket_address = socket_address  # Socket地址：如 "tcp://127.0.0.1:49202"
@@ -390,7 +820,8 @@ class SocketControlledDevice(BaseDevice):
         socket_type = socket_type or self._socket_type
         timeout = timeout or self._socket_timeout
         
-        context = zmq.Context()
+        # 所有设备共用进程级的ZMQ Context（只有一个I/O线程），关闭socket时不销毁Context
+        context = zmq.Context.instance()
         socket = context.socket(socket_type)
         socket.setsockopt(zmq.RCVTIMEO, timeout)
         socket.setsockopt(zmq.LINGER, 0)  # 关闭时不等待未发送的消息
@@ -429,15 +860,31 @@ class SocketControlledDevice(BaseDevice):
         if self.socket:
             try:
                 self.socket.close()
-            except:
+            except Exception:
                 pass
             self.socket = None
-        if self.context:
+        # context 为进程共享实例，只释放引用
+        self.context = None
+
+    def _reset_socket(self) -> bool:
+        """重建并重新连接socket（REQ请求超时后状态机停在等待应答，只有重建才能继续发送）
+        :return: 是否重建成功；失败时标记为未连接，由保活任务重连
+        """
+        if self.socket:
             try:
-                self.context.term()
-            except:
+                self.socket.close()
+            except Exception:
                 pass
-            self.context = None
+            self.socket = None
+        try:
+            self.context, self.socket = self._create_socket()
+            self.socket.connect(self.socket_address)
+            return True
+        except Exception as e:
+            self.is_connected = False
+            self.message = f"Socket重建失败: {str(e)}"
+            self._cleanup_socket()
+            return False
 
     def disconnect(self):
         """Socket设备通用断开逻辑"""
@@ -447,34 +894,53 @@ class SocketControlledDevice(BaseDevice):
 
 class RestAPIControlledDevice(BaseDevice):
     """REST API控制设备的通用逻辑"""
+    __slots__ = ('api_base_url', 'api_token', 'api_token_type', 'api_headers', 'http', '_probe_addr')
+
     def __init__(self, device_name: str, device_id: str, api_base_url: str):
         super().__init__(device_name, "RESTAPI", device_id)
         self.api_base_url = api_base_url  # API基础地址：如 "http://192.168.1.100/api/v1"
         self.api_token = None             # API认证令牌
         self.api_token_type = None        # API认证令牌类型
         self.api_headers = {}             # API认证头部
+        # 可达性探测地址 (host, port)，初始化时解析一次
+        url = urlparse(api_base_url)
+        self._probe_addr = (url.hostname, url.port or (443 if url.scheme == "https" else 80))
+        # 复用的HTTP会话：保持长连接，避免每次请求重新建立TCP连接
+        # 连接失败时自动快速重试2次（POST等非幂等请求只在连接未建立时重试）
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8,
+                              max_retries=Retry(total=2, backoff_factor=0.1, allowed_methods=Retry.DEFAULT_ALLOWED_METHODS))
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+
+    def probe(self, timeout: float = 0.3) -> bool:
+        """TCP可达性探测：只建立并立即关闭一次TCP连接（约1个RTT），不发送HTTP请求"""
+        try:
+            with socket.create_connection(self._probe_addr, timeout=timeout):
+                return True
+        except OSError:
+            return False
 
     def connect(self):
-        """REST API设备通用连接逻辑（实际为认证/可达性检测）"""
-        try:
-            # 检测API是否可达
-            response = requests.get(f"{self.api_base_url}/health", timeout=5)
-            if response.status_code == 200:
-                self.is_connected = True
-                print(f"[{self.device_name}] REST API设备连接成功")
-            else:
-                raise Exception(f"API健康检查失败，状态码：{response.status_code}")
-        except Exception as e:
-            print(f"[{self.device_name}] REST API设备连接失败：{e}")
+        """REST API设备通用连接逻辑（可达性检测）"""
+        if self.probe():
+            self.is_connected = True
+            logger.info("{}REST API设备连接成功", self._log_prefix)
+        else:
+            logger.error("{}REST API设备连接失败：{}:{} 不可达", self._log_prefix, *self._probe_addr)
             self.is_connected = False
+        return self.is_connected
 
     def disconnect(self):
-        """REST API设备通用断开逻辑（无实际连接，仅标记状态）"""
+        """REST API设备通用断开逻辑（关闭会话中的空闲连接）"""
+        self.http.close()
         self.is_connected = False
-        print(f"[{self.device_name}] REST API设备断开连接")
+        logger.info("{}REST API设备断开连接", self._log_prefix)
 
 class SerialControlledDevice(BaseDevice):
     """Serial控制设备的通用逻辑"""
+    __slots__ = ('serial_port', 'serial_baudrate', 'serial_client')
+
     def __init__(self, device_name: str, device_id: str, serial_port: str, serial_baudrate: int = 9600):
         super().__init__(device_name, "Serial", device_id)
         self.serial_port = serial_port
@@ -1,16 +1,76 @@
+import selectors
 import socket
 import struct
-import binascii
+import threading
 import time
+from concurrent.futures import Future
+from functools import lru_cache
 from typing import Literal
-from .base import ModbusControlledDevice, DeviceStatus
-import config
-from utils import (
-    cent_format_time, 
-    cent_get_value
-)
-
-# 全局变量定义
+from .base import ModbusControlledDevice, DeviceStatus, DEVICE_POOL
+from config import get_settings
+from utils import cent_format_time
+
+# CRC16/MODBUS 计算：优先使用 fastcrc（Rust实现），其次 crcmod（C扩展），都未安装时退回纯Python实现
+try:
+    from fastcrc import crc16 as _fastcrc16
+    FASTCRC_AVAILABLE = True
+except ImportError:
+    _fastcrc16 = None
+    FASTCRC_AVAILABLE = False
+
+try:
+    from crcmod.predefined import mkPredefinedCrcFun
+    _crcmod16 = mkPredefinedCrcFun('modbus')
+    CRCMOD_AVAILABLE = True
+except ImportError:
+    _crcmod16 = None
+    CRCMOD_AVAILABLE = False
+
+
+def _crc16_modbus_table() -> tuple:
+    """生成CRC16/MODBUS（多项式0xA001）的256项查找表"""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 0x0001 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_MODBUS_TABLE = _crc16_modbus_table()
+
+
+def _crc16_modbus_py(data, _table=_CRC16_MODBUS_TABLE) -> int:
+    """纯Python的CRC16/MODBUS（多项式0xA001），按字节查表计算"""
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ _table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+if FASTCRC_AVAILABLE:
+    crc16_modbus = _fastcrc16.modbus
+elif CRCMOD_AVAILABLE:
+    crc16_modbus = _crcmod16
+else:
+    crc16_modbus = _crc16_modbus_py
+
+# 写单个寄存器的命令部分：地址 + 功能码 + 寄存器地址 + 数据；CRC字段为小端16位
+_WRITE_HEADER = struct.Struct('>BBHH')
+_CRC_FIELD = struct.Struct('<H')
+
+
+@lru_cache(maxsize=256)
+def _build_write_frame(address: int, value: int) -> bytes:
+    """组装写单个寄存器(功能码06)的完整帧并缓存，设定值种类有限，重复下发时直接复用
+    协议格式：地址(1B) + 功能码06(1B) + 寄存器地址(2B) + 数据(2B) + CRC(2B)，离心机地址是 0x01
+    """
+    cmd_part = _WRITE_HEADER.pack(0x01, 0x06, address, value)
+    return cmd_part + _CRC_FIELD.pack(crc16_modbus(cmd_part))
+
+
+# 全局变量定义（固定指令直接使用完整帧，含CRC）
 CENT_CMDS = {
     "start": bytes([0x01, 0x06, 0x20, 0x00, 0x00, 0x01, 0x43, 0xCA]),
     "stop": bytes([0x01, 0x06, 0x20, 0x00, 0x00, 0x02, 0x03, 0xCB]),
@@ -26,29 +86,60 @@ CENT_ROTOR_MAP = {0: "不定态", 1: "加速中", 2: "恒速运行", 3: "降速
 CENT_DOOR_MAP = {1: "门窗开启", 2: "门窗关闭"}
 CENT_LID_MAP = {1: "门盖开启", 2: "门盖关闭"}
 
+# read_all 应答帧: 地址(1B) + 功能码(1B) + 字节数(1B) + 14个寄存器(28B) + CRC(2B)
+_CENT_RECORD = struct.Struct('>14H')
+
+def decode_status(frame, _unpack_from=_CENT_RECORD.unpack_from, _format_time=cent_format_time,
+                  _run=CENT_RUN_MAP, _rotor=CENT_ROTOR_MAP, _fault=CENT_FAULT_MAP,
+                  _door=CENT_DOOR_MAP, _lid=CENT_LID_MAP) -> dict:
+    """从 read_all 应答帧一次性解出面向前端的状态数据（字段与 CentrifugeStatus 一致）
+    解包与状态码转文字合并为一步，映射表通过默认参数绑定为局部变量
+    """
+    (_, actual_rpm, centrifuge_force, run_time, fault_code, run_state, door_window, _,
+     setted_rpm, setted_time, _, door_lid, rotor_state, remain_time) = _unpack_from(frame, 3)
+    return {
+        "actual_rpm": actual_rpm,
+        "centrifuge_force": centrifuge_force,
+        "run_time": run_time,
+        "fault_code": _fault.get(fault_code, "未知故障码"),
+        "run_state": _run.get(run_state, "状态未知"),
+        "door_window": _door.get(door_window, "未知代码"),
+        "setted_rpm": setted_rpm,
+        "setted_time": setted_time,
+        "door_lid": _lid.get(door_lid, "未知代码"),
+        "rotor_state": _rotor.get(rotor_state, "静止"),
+        "remain_time": _format_time(remain_time)
+    }
+
+
 class CentrifugeController(ModbusControlledDevice):
     """Modbus控制的离心机设备"""
+    __slots__ = ('timeout', '_display_cache', '_parsed_cache', '_sock', '_sock_lock', '_recv_view',
+                 '_selector')
     
     def __init__(self, device_id: str = "01", host: str = None, port: int = None, timeout: int = None):
+        settings = get_settings()
         # 从环境变量获取配置，如果没有提供参数则使用默认值
-        host = host or config.CENTRIFUGE_HOST
-        port = port or config.CENTRIFUGE_PORT
-        timeout = timeout or config.CENTRIFUGE_TIMEOUT
+        host = host or settings.centrifuge_host
+        port = port or settings.centrifuge_port
+        timeout = timeout or settings.centrifuge_timeout
         super().__init__("modbus_centrifuge_" + device_id, device_id, host, port)
         self.timeout = timeout
+        # 上一次 read_all 应答帧及其解析结果 (frame, data)，帧内容未变化时直接复用，不再重复解析；
+        # 帧与结果放在同一个元组中整体替换，并发读取时不会取到不配对的结果
+        self._display_cache = (None, None)
+        self._parsed_cache = (None, None)
+        # 到离心机的TCP长连接，命令复用同一连接，避免每次请求都重新握手
+        self._sock = None
+        self._sock_lock = threading.Lock()
+        # 接收缓冲（只在持有 _sock_lock 时使用）
+        self._recv_view = memoryview(bytearray(1024))
+        # 等待应答可读的选择器，长连接建立时注册
+        self._selector = selectors.DefaultSelector()
 
     def _calculate_crc(self, data):
         """计算Modbus CRC校验码"""
-        crc = 0xFFFF
-        for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc >>= 1
-                    crc ^= 0xA001
-                else:
-                    crc >>= 1
-        return struct.pack('<H', crc)
+        return _CRC_FIELD.pack(crc16_modbus(bytes(data)))
 
     def build_write_command(self, address, value):
         """
@@ -56,82 +147,188 @@ class CentrifugeController(ModbusControlledDevice):
         address: 寄存器地址 (比如设置转速是 0x2101)
         value: 要设置的值 (比如 1500)
         """
-        # 协议格式：地址(1B) + 功能码06(1B) + 寄存器地址(2B) + 数据(2B)
-        # 离心机地址是 0x01
-        cmd_part = struct.pack('>BBHH', 0x01, 0x06, address, value)
-        crc = self._calculate_crc(cmd_part)
-        return cmd_part + crc
+        return _build_write_frame(address, value)
 
     def send_raw(self, hex_cmd):
-        """发送原始Modbus命令并接收响应"""
+        """发送原始Modbus命令并接收响应
+        :return: 成功时 {"status": "success", "bytes": 应答帧}，需要十六进制文本时调用 result["bytes"].hex()
+        """
         if not self.is_connected:
             return {"status": "error", "message": "设备未连接"}
-        
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(self.timeout)
-        try:
-            sock.connect((self.modbus_addr, self.modbus_port))
-            
-            # 清空缓冲区
-            sock.settimeout(0.1)
+        return self._transact(hex_cmd)
+
+    def send_raw_async(self, hex_cmd) -> Future:
+        """在 DEVICE_POOL 中执行 send_raw，立即返回 Future
+        事件循环中用 await asyncio.wrap_future(...) 等待；多台设备可配合 asyncio.gather 并发下发
+        """
+        return DEVICE_POOL.submit(self.send_raw, hex_cmd)
+
+    def _open_socket(self):
+        """建立到离心机的TCP长连接，并注册到选择器用于等待应答"""
+        sock = socket.create_connection((self.modbus_addr, self.modbus_port), timeout=self.timeout)
+        # Modbus报文都很小，关闭Nagle算法，避免与延迟ACK叠加造成的等待
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # 长连接空闲期间由内核探测对端是否还在，设备掉电等情况不必等到下一次请求超时才发现
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        self._selector.register(sock, selectors.EVENT_READ)
+        self._sock = sock
+        return sock
+
+    def _close_socket(self):
+        """关闭TCP长连接"""
+        if self._sock is not None:
             try:
-                while sock.recv(1024):
-                    pass
-            except:
+                self._selector.unregister(self._sock)
+            except (KeyError, ValueError):
                 pass
-            sock.settimeout(self.timeout)
-
-            # 发送指令
-            sock.sendall(hex_cmd)
-
-            # 接收数据
-            buffer = b''
-            start_time = time.time()
-            expected_header = b'\x01\x03\x1C'
-            is_read_cmd = (hex_cmd[1] == 0x03)
-            
-            while time.time() - start_time < self.timeout:
-                try:
-                    chunk = sock.recv(1024)
-                    if not chunk:
-                        break
-                    buffer += chunk
-                    
-                    if is_read_cmd:
-                        start_idx = buffer.find(expected_header)
-                        if start_idx != -1:
-                            buffer = buffer[start_idx:]
-                            if len(buffer) >= 33:
-                                valid_frame = buffer[:33]
-                                response_hex = binascii.hexlify(valid_frame).decode('utf-8')
-                                return {"status": "success", "hex": response_hex, "bytes": list(valid_frame)}
-                        else:
-                            if len(buffer) > 100:
-                                buffer = buffer[-20:]
-                    else:
-                        if len(buffer) >= 8 and buffer.startswith(b'\x01\x06'):
-                            valid_frame = buffer[:8]
-                            response_hex = binascii.hexlify(valid_frame).decode('utf-8')
-                            return {"status": "success", "hex": response_hex, "bytes": list(valid_frame)}
-                            
-                except socket.timeout:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _transact(self, hex_cmd):
+        """在长连接上发送命令并接收应答（Modbus为半双工，同一时间只允许一个请求）
+        设备端关闭了空闲连接时重建连接并重试一次
+        """
+        with self._sock_lock:
+            try:
+                return self._exchange(hex_cmd)
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                self._close_socket()
+            except Exception as e:
+                self._close_socket()
+                return {"status": "error", "message": str(e)}
+            try:
+                return self._exchange(hex_cmd)
+            except Exception as e:
+                self._close_socket()
+                return {"status": "error", "message": str(e)}
+
+    def _recv_into(self, view, deadline) -> int:
+        """在截止时间(time.monotonic)前等待数据可读并接收到view
+        :return: 接收的字节数；超时返回0
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self._selector.select(remaining):
+            return 0
+        nread = self._sock.recv_into(view)
+        if not nread:
+            raise ConnectionResetError("连接已被设备关闭")
+        return nread
+
+    def _recv_exact(self, view, n, deadline) -> bool:
+        """在截止时间前精确读取n个字节到view[:n]
+        :return: 是否读满n个字节
+        """
+        received = 0
+        while received < n:
+            nread = self._recv_into(view[received:n], deadline)
+            if not nread:
+                return False
+            received += nread
+        return True
+
+    def _drain(self, sock):
+        """清空缓冲区（丢弃上一次请求之后迟到的数据），只处理已到达的数据，不额外等待"""
+        scratch = self._recv_view
+        while self._selector.select(0):
+            if not sock.recv_into(scratch):
+                raise ConnectionResetError("连接已被设备关闭")
+
+    def _exchange(self, hex_cmd):
+        """发送一条命令并按帧头对齐接收应答"""
+        sock = self._sock or self._open_socket()
+        self._drain(sock)
+
+        # 发送指令
+        sock.sendall(hex_cmd)
+        # 整个应答的截止时间，各次等待共用
+        return self._read_reply(hex_cmd, time.monotonic() + self.timeout)
+
+    def _read_reply(self, hex_cmd, deadline, scan: bool = True):
+        """接收 hex_cmd 对应的一帧应答
+        :param scan: 帧头不符时是否按帧头搜索对齐；为False时直接判定失败（批量发送时后续应答紧跟在后面，不能越过）
+        """
+        # 应答帧头与长度固定：read_all 为 01 03 1C + 28字节数据 + CRC 共33字节，写寄存器为8字节回显
+        if hex_cmd[1] == 0x03:
+            expected_header, frame_len = b'\x01\x03\x1C', 33
+        else:
+            expected_header, frame_len = b'\x01\x06', 8
+        head_len = len(expected_header)
+
+        # 接收数据：recv_into 复用固定的接收缓冲；先精确读取帧头，帧头正确时再精确读取剩余部分
+        scratch = self._recv_view
+        if not self._recv_exact(scratch, head_len, deadline):
+            self._close_socket()
+            return {"status": "error", "message": "数据对齐失败，等待应答超时"}
+        if scratch[:head_len] == expected_header:
+            if not self._recv_exact(scratch[head_len:], frame_len - head_len, deadline):
+                self._close_socket()
+                return {"status": "error", "message": "数据对齐失败，应答帧不完整"}
+            valid_frame = bytes(scratch[:frame_len])
+            return {"status": "success", "bytes": valid_frame}
+
+        # 帧头不符（前面有残留数据），退回按帧头搜索对齐；
+        # 残留数据最多容忍一帧的长度，超出即判定为协议错误，每次只接收还缺的字节数
+        buffer = bytearray(scratch[:head_len])
+        limit = 2 * frame_len
+        while scan:
+            start_idx = buffer.find(expected_header)
+            if start_idx != -1:
+                needed = start_idx + frame_len - len(buffer)
+                if needed <= 0:
+                    valid_frame = bytes(buffer[start_idx:start_idx + frame_len])
+                    return {"status": "success", "bytes": valid_frame}
+            else:
+                needed = limit - len(buffer)
+                if needed <= 0:
                     break
-            
-            return {
-                "status": "error",
-                "message": f"数据对齐失败，缓冲区: {binascii.hexlify(buffer).decode('utf-8')}"
-            }
+            nread = self._recv_into(scratch[:needed], deadline)
+            if not nread:
+                break
+            buffer += scratch[:nread]
 
-        except Exception as e:
-            return {"status": "error", "message": str(e)}
-        finally:
-            sock.close()
+        # 未能对齐应答帧（超时或收到异常数据），重建连接，避免残留数据影响后续请求
+        self._close_socket()
+        return {
+            "status": "error",
+            "message": f"数据对齐失败，缓冲区: {buffer.hex()}"
+        }
+
+    def send_batch(self, commands: list) -> list:
+        """在同一连接上连续发送多条命令（一次写入），再依次接收各条应答，多条命令只需一次往返等待
+        如 [CENT_CMDS['stop'], CENT_CMDS['open']]；某条失败后其余命令的结果均为失败（连接已重建，不自动重试）
+        :return: 与 commands 一一对应的结果列表，格式同 send_raw
+        """
+        if not self.is_connected:
+            return [{"status": "error", "message": "设备未连接"} for _ in commands]
+        results = []
+        with self._sock_lock:
+            try:
+                sock = self._sock or self._open_socket()
+                self._drain(sock)
+                sock.sendall(b''.join(commands))
+                for hex_cmd in commands:
+                    result = self._read_reply(hex_cmd, time.monotonic() + self.timeout, scan=False)
+                    results.append(result)
+                    if result["status"] != "success":
+                        break
+            except Exception as e:
+                self._close_socket()
+                results.append({"status": "error", "message": str(e)})
+        if len(results) < len(commands):
+            message = results[-1].get("message", "未知错误")
+            results.extend({"status": "error", "message": f"前序命令失败: {message}"}
+                           for _ in range(len(commands) - len(results)))
+        return results[:len(commands)]
 
     def connect(self):
         """连接Modbus设备"""
         try:
-            # 测试连接：发送读取命令
-            test_result = self.send_raw(CENT_CMDS['read_all'])
+            # 测试连接：发送读取命令（同时建立长连接）；重连后不沿用断线前的解析缓存
+            self._display_cache = self._parsed_cache = (None, None)
+            test_result = self._transact(CENT_CMDS['read_all'])
             if test_result.get("status") == "success":
                 self.is_connected = True
                 self.message = "离心机连接成功"
@@ -150,6 +347,9 @@ class CentrifugeController(ModbusControlledDevice):
 
     def disconnect(self):
         """断开Modbus设备连接"""
+        with self._sock_lock:
+            self._close_socket()
+        self._display_cache = self._parsed_cache = (None, None)
         self.is_connected = False
         self.message = "离心机已断开连接"
         self.status = DeviceStatus.disconnected
@@ -300,28 +500,9 @@ class CentrifugeController(ModbusControlledDevice):
             - 设置时间 setted_time
             - 运行时间 run_time
         """
-        # 当前转速
-        actual_rpm = cent_get_value(data_bytes, 1)
-        # 离心力
-        centrifuge_force = cent_get_value(data_bytes, 2)
-        # 运行时间
-        run_time = cent_get_value(data_bytes, 3)
-        # 故障码
-        fault_code = cent_get_value(data_bytes, 4)
-        # 运行状态
-        run_state = cent_get_value(data_bytes, 5)
-        # 门窗状态
-        door_window = cent_get_value(data_bytes, 6)
-        # 设置转速
-        setted_rpm = cent_get_value(data_bytes, 8)
-        # 设置时间
-        setted_time = cent_get_value(data_bytes, 9)
-        # 门盖状态
-        door_lid = cent_get_value(data_bytes, 11)
-        # 机器状态
-        rotor_state = cent_get_value(data_bytes, 12)
-        # 剩余时间
-        remain_time = cent_get_value(data_bytes, 13)
+        # 一次解出全部14个寄存器，寄存器序号即字段下标
+        (_, actual_rpm, centrifuge_force, run_time, fault_code, run_state, door_window, _,
+         setted_rpm, setted_time, _, door_lid, rotor_state, remain_time) = _CENT_RECORD.unpack_from(data_bytes, 3)
 
         return {
             "actual_rpm": actual_rpm,
@@ -337,9 +518,9 @@ class CentrifugeController(ModbusControlledDevice):
             "remain_time": remain_time
         }
 
-    def get_status(self) -> DeviceStatus:
-        """获取设备状态信息"""
-        return self.status
+    def get_status(self) -> str:
+        """获取设备状态信息，返回状态的中文名称（与PLC、XRD控制器一致）"""
+        return self.status.label
 
     def get_running_status(self) -> dict:
         """获取设备运行状态信息"""
@@ -353,6 +534,32 @@ class CentrifugeController(ModbusControlledDevice):
         else:
             return {"status": "error", "message": result.get("message", "未知错误")}
 
+    def _read_status_frame(self):
+        """读取 read_all 应答帧
+        :return: (frame, error)，成功时error为None
+        """
+        result = self.send_raw(CENT_CMDS['read_all'])
+        if result.get("status") == "success" and "bytes" in result:
+            data = result["bytes"]
+            if len(data) < 33:
+                return None, "数据不完整"
+            return data, None
+        return None, f"读取状态失败: {result.get('message', '未知错误')}"
+
+    def get_display_status(self) -> dict:
+        """获取面向前端的运行状态（状态码已转换为文字）"""
+        if not self.is_connected:
+            return {"status": "error", "message": "设备未连接"}
+        frame, error = self._read_status_frame()
+        if error:
+            return {"status": "error", "message": error}
+        # 应答帧是33字节的bytes，直接比较内容即可判断是否变化（比计算哈希更省）
+        last_frame, data = self._display_cache
+        if frame != last_frame:
+            data = decode_status(frame)
+            self._display_cache = (frame, data)
+        return {"status": "success", "data": data.copy()}
+
     def get_result(self) -> dict:
         """获取设备状态结果"""
         if not self.is_connected:
@@ -360,15 +567,15 @@ class CentrifugeController(ModbusControlledDevice):
             return self.result
         
         # 读取实时状态
-        result = self.send_raw(CENT_CMDS['read_all'])
-        if result.get("status") == "success" and "bytes" in result:
-            data = result["bytes"]
-            if len(data) < 33:
-                self.result = {"status": "error", "message": "数据不完整"}
-            else:
-                self.result = {"status": "success", "data": self._parse_status_data(data)}
+        frame, error = self._read_status_frame()
+        if error:
+            self.result = {"status": "error", "message": error}
         else:
-            self.result = {"status": "error", "message": f"读取状态失败: {result.get('message', '未知错误')}"}
+            last_frame, data = self._parsed_cache
+            if frame != last_frame:
+                data = self._parse_status_data(frame)
+                self._parsed_cache = (frame, data)
+            self.result = {"status": "success", "data": data.copy()}
         return self.result
 
     def get_message(self) -> str:
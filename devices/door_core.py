@@ -1,23 +1,38 @@
 import zmq
 import time
 from .base import SocketControlledDevice
-import config
+from config import get_settings
+from logger import sys_logger as logger
 from typing import Literal
 
 from schemas.door import DoorActionCode
 
+# 门状态缓存的有效期(秒)，有效期内 get_door_status 直接返回缓存，不再往返查询
+DOOR_STATUS_TTL = 0.2
+
+# 6扇门分属3个从站，从站号 = (门编号 + 1) // 2；奇数门为通道0，偶数门为通道1
+# 从站号 -> 状态查询帧
+_SLAVE_STATUS_FRAMES = {slave_id: bytes([0x02, slave_id, 0, 0, 0]) for slave_id in range(1, 4)}
+# 门编号 -> (状态查询帧, 状态位所在的应答字节下标)
+_DOOR_STATUS_FRAMES = {door: (_SLAVE_STATUS_FRAMES[(door + 1) // 2], 1 if door % 2 == 0 else 0)
+                       for door in range(1, 7)}
+# (门编号, 动作) -> 控制帧 (0x01, 从站号, 通道, 0, 动作码)
+_CTRL_FRAMES = {(door, action): bytes([0x01, (door + 1) // 2, 0 if door % 2 == 1 else 1, 0, action.value])
+                for door in range(1, 7) for action in DoorActionCode}
+
 
 class DoorController(SocketControlledDevice):
     """Socket（ZMQ）控制的防护门设备"""
+    __slots__ = ('target_address', 'door_status_cache')
     
     def __init__(self, device_id: str = "01", 
                 target_address: str = None):
         # 从环境变量获取配置，如果没有提供参数则使用默认值
-        target_address = target_address or config.DOOR_TARGET_ADDRESS
+        target_address = target_address or get_settings().door_target_address
         # ZMQ Socket通信
         super().__init__("socket_door_" + device_id, device_id, target_address)
         self.target_address = target_address
-        self.door_status_cache = {}  # 缓存门状态
+        self.door_status_cache = {}  # 缓存门状态: 门编号 -> (是否开启, 更新时刻 time.monotonic())
         self._socket_timeout = 1000  # 设置默认超时时间
 
     def connect(self):
@@ -31,7 +46,7 @@ class DoorController(SocketControlledDevice):
             self.socket.connect(self.target_address)
             
             # 测试连接：尝试获取门状态
-            self.socket.send(bytes([0x02, 1, 0, 0, 0]))
+            self.socket.send(_SLAVE_STATUS_FRAMES[1])
             self.socket.recv()
             
             self.message = "防护门设备连接成功"
@@ -47,11 +62,12 @@ class DoorController(SocketControlledDevice):
         super().disconnect()  # 调用基类的断开逻辑
         self.message = "防护门设备已断开连接"
 
-    def get_door_status(self, door_index: int):
+    def get_door_status(self, door_index: int, max_age: float = DOOR_STATUS_TTL):
         """
         获取指定编号玻璃门的实时状态
         Args:
             door_index: int
+            max_age: 缓存状态的最大允许时长(秒)，0 表示强制查询
         Returns:
             门状态: bool
                 True: 开启
@@ -62,24 +78,28 @@ class DoorController(SocketControlledDevice):
             self.result = {"status": "error", "message": self.message}
             return self.result
 
-        if not (1 <= door_index <= 6):
+        frame = _DOOR_STATUS_FRAMES.get(door_index)
+        if frame is None:
             self.message = "无效编号"
             self.result = {"status": "error", "message": self.message}
             return self.result
+        buffer, channel = frame
 
-        slave_id = (door_index + 1) // 2
-        is_channel_1 = (door_index % 2 == 0)
-        buffer = bytes([0x02, slave_id, 0, 0, 0])
+        cached = self.door_status_cache.get(door_index)
+        if cached is not None and time.monotonic() - cached[1] < max_age:
+            is_open = cached[0]
+            self.message = f"门{door_index}状态获取成功: {is_open}"
+            self.result = {"status": "success", "message": self.message, "data": is_open}
+            return self.result
 
         try:
             self.socket.send(buffer)
             response_bytes = self.socket.recv()
 
             if len(response_bytes) == 2:
-                target_byte = response_bytes[1] if is_channel_1 else response_bytes[0]
-                is_open = (target_byte & 1) == 1
+                is_open = (response_bytes[channel] & 1) == 1
                 # status = "open" if is_open else "close"
-                self.door_status_cache[door_index] = is_open
+                self.door_status_cache[door_index] = (is_open, time.monotonic())
                 self.message = f"门{door_index}状态获取成功: {is_open}"
                 self.result = {"status": "success", "message": self.message, "data": is_open}
                 return self.result
@@ -89,6 +109,7 @@ class DoorController(SocketControlledDevice):
                 return self.result
 
         except zmq.Again:
+            self._reset_socket()
             self.message = "通信超时"
             self.result = {"status": "error", "message": self.message}
             return self.result
@@ -99,6 +120,51 @@ class DoorController(SocketControlledDevice):
             self.result = {"status": "error", "message": self.message}
             return self.result
 
+    def get_all_door_status(self):
+        """
+        获取全部6扇玻璃门的实时状态
+        每个从站的一次应答同时包含两个通道，因此只需3次往返即可得到6扇门的状态
+        Returns:
+            data: dict[int, bool]，门编号 -> 是否开启
+        """
+        if not self.is_connected or not self.socket:
+            self.message = "设备未连接"
+            self.result = {"status": "error", "message": self.message}
+            return self.result
+
+        status_dict = {}
+        for slave_id in range(1, 4):
+            try:
+                self.socket.send(_SLAVE_STATUS_FRAMES[slave_id])
+                response_bytes = self.socket.recv()
+            except zmq.Again:
+                self._reset_socket()
+                self.message = "通信超时"
+                self.result = {"status": "error", "message": self.message}
+                return self.result
+            except Exception as e:
+                # 如果socket出错，标记为未连接
+                self.is_connected = False
+                self.message = f"获取从站{slave_id}门状态异常: {str(e)}"
+                self.result = {"status": "error", "message": self.message}
+                return self.result
+
+            if len(response_bytes) != 2:
+                self.message = "数据异常"
+                self.result = {"status": "error", "message": self.message}
+                return self.result
+
+            # 奇数门对应通道0(response[0])，偶数门对应通道1(response[1])
+            odd_door, even_door = slave_id * 2 - 1, slave_id * 2
+            status_dict[odd_door] = (response_bytes[0] & 1) == 1
+            status_dict[even_door] = (response_bytes[1] & 1) == 1
+
+        now = time.monotonic()
+        self.door_status_cache.update((door, (is_open, now)) for door, is_open in status_dict.items())
+        self.message = "全部门状态获取成功"
+        self.result = {"status": "success", "message": self.message, "data": status_dict}
+        return self.result
+
     def send_command(self, door_index: int, action: DoorActionCode):
         """
         控制开门/关门
@@ -123,12 +189,12 @@ class DoorController(SocketControlledDevice):
             else:
                 partner_index = door_index - 1
 
-            # 读取搭档的状态
-            partner_status = self.get_door_status(partner_index)
+            # 读取搭档的状态：安全检查必须实时查询，不使用缓存（门可能被手动或其他客户端打开）
+            partner_status = self.get_door_status(partner_index, max_age=0)
 
             # 如果搭档是开着的，必须先把它关掉
-            if partner_status == "开启":
-                print(f"[系统自动] 检测到互斥：门{partner_index}当前开启，正在尝试自动关闭...")
+            if partner_status.get("data") is True:
+                logger.warning("[系统自动] 检测到互斥：门{}当前开启，正在尝试自动关闭...", partner_index)
 
                 # 递归调用自己，把搭档关掉
                 close_result = self.send_command(partner_index, DoorActionCode.close)
@@ -143,17 +209,16 @@ class DoorController(SocketControlledDevice):
                 # 稍微停顿一下，给硬件反应时间
                 time.sleep(0.5)
 
-        slave_id = (door_index + 1) // 2
-        channel = 0 if door_index % 2 == 1 else 1
-        value = action.value
         # 控制指令: 0x01 ...
-        buffer = bytes([0x01, slave_id, channel, 0, value])
+        buffer = _CTRL_FRAMES[(door_index, action)]
 
         try:
             self.socket.send(buffer)
             frame_string = self.socket.recv_string()
 
             if frame_string == "True":
+                # 门状态随指令确定，直接更新缓存（仅供状态显示，互斥检查始终实时查询）
+                self.door_status_cache[door_index] = (action == DoorActionCode.open, time.monotonic())
                 self.message = f"门{door_index} {action}操作成功"
                 self.result = {
                     "status": "success", 
@@ -166,6 +231,7 @@ class DoorController(SocketControlledDevice):
                 self.result = {"status": "fail", "message": self.message}
                 return self.result
         except zmq.Again:
+            self._reset_socket()
             self.message = f"门{door_index} {action}操作超时"
             self.result = {"status": "error", "message": self.message}
             return self.result
@@ -187,8 +253,8 @@ class DoorController(SocketControlledDevice):
         self.result = {"status": "success", "message": "门设备已停止"}
 
     def get_status(self) -> dict:
-        """获取设备状态"""
-        return self.status
+        """获取设备状态，返回状态的中文名称（与PLC、XRD控制器一致）"""
+        return self.status.label
 
     def get_result(self) -> dict:
         """获取设备结果"""
@@ -2,7 +2,13 @@ import requests
 import time
 from typing import Dict, Any, List, Optional
 from .base import RestAPIControlledDevice, DeviceStatus
-import config
+from config import get_settings
+
+# 配料设备API接口名（完整地址在初始化时按 api_base_url 拼接一次）
+_API_ENDPOINTS = ("Token", "GetTaskInfo", "AddTask", "StartTask", "StopTask", "CancelTask")
+
+# get_status / get_result 中任务详情的缓存时间(秒)
+STATUS_CACHE_TTL = 1.0
 
 
 class MixerController(RestAPIControlledDevice):
@@ -10,16 +16,24 @@ class MixerController(RestAPIControlledDevice):
     RestAPI控制的配料设备
     基于配料设备API文档实现所有功能
     """
+    __slots__ = ('_api_urls', 'current_task_id', 'current_task_status', 'task_info_cache', '_status_cache',
+                 '_status_static', 'username', 'password')
     
     def __init__(self, device_id: str = "01", api_base_url: str = None, username: str = None, password: str = None):
+        settings = get_settings()
         # 从环境变量获取配置，如果没有提供参数则使用默认值
-        api_base_url = api_base_url or config.MIXER_API_BASE_URL
-        username = username or config.MIXER_USERNAME
-        password = password or config.MIXER_PASSWORD
+        api_base_url = api_base_url or settings.mixer_api_base_url
+        username = username or settings.mixer_username
+        password = password or settings.mixer_password
         super().__init__("restapi_mixer_" + device_id, device_id, api_base_url)
+        self._api_urls = {name: f"{api_base_url}/api/{name}" for name in _API_ENDPOINTS}
         self.current_task_id = None
         self.current_task_status = None # 由get_task_info获取
         self.task_info_cache = {}
+        # 当前任务详情的短时缓存: (获取时刻, task_id, 任务详情)，创建/启动/暂停/取消任务后失效
+        self._status_cache = None
+        # get_status 中不会变化的字段，初始化时生成一次
+        self._status_static = {"name": self.device_name}
         self.username = username
         self.password = password
         self.api_headers = {
@@ -29,13 +43,18 @@ class MixerController(RestAPIControlledDevice):
 
     def connect(self):
         """连接配料设备（检测API是否可达），获取Token"""
+        # 先做TCP探测，设备离线时快速失败，不必等待Token请求超时
+        if not self.probe():
+            self.is_connected = False
+            self.message = f"配料设备不可达: {self.api_base_url}"
+            return False
         try:
             payload = {
                 "username": self.username,
                 "password": self.password
             }
             # 尝试获取任务信息来检测连接
-            response = requests.post(f"{self.api_base_url}/api/Token", json=payload, timeout=5)
+            response = self.http.post(self._api_urls["Token"], json=payload, timeout=5)
             if response.status_code == 200:
                 self.api_token = response.json()["access_token"]
                 self.api_token_type = response.json()["token_type"]
@@ -55,7 +74,9 @@ class MixerController(RestAPIControlledDevice):
 
     def disconnect(self):
         """断开配料设备连接"""
+        self.http.close()
         self.is_connected = False
+        self._status_cache = None
         self.api_token = None
         self.api_token_type = None
         self.api_headers = {}
@@ -76,8 +97,8 @@ class MixerController(RestAPIControlledDevice):
             if task_id is not None:
                 payload["task_id"] = task_id
 
-            response = requests.post(
-                f"{self.api_base_url}/api/GetTaskInfo",
+            response = self.http.post(
+                self._api_urls["GetTaskInfo"],
                 json=payload,
                 timeout=10,
                 headers=self.api_headers
@@ -131,12 +152,14 @@ class MixerController(RestAPIControlledDevice):
             if is_copy:
                 payload["is_copy"] = is_copy
 
-            response = requests.post(
-                f"{self.api_base_url}/api/AddTask",
+            response = self.http.post(
+                self._api_urls["AddTask"],
                 json=payload,
                 timeout=30,
                 headers=self.api_headers
             )
+            # 任务状态可能已改变，丢弃缓存的任务详情
+            self._status_cache = None
             response.raise_for_status()
             data = response.json()
             
@@ -185,12 +208,14 @@ class MixerController(RestAPIControlledDevice):
             if use_tip_type:
                 payload["use_tip_type"] = use_tip_type
 
-            response = requests.post(
-                f"{self.api_base_url}/api/StartTask",
+            response = self.http.post(
+                self._api_urls["StartTask"],
                 json=payload,
                 timeout=30,
                 headers=self.api_headers
             )
+            # 任务状态可能已改变，丢弃缓存的任务详情
+            self._status_cache = None
             response.raise_for_status()
             data = response.json()
             
@@ -219,12 +244,14 @@ class MixerController(RestAPIControlledDevice):
         try:
             payload = {"task_id": task_id}
 
-            response = requests.post(
-                f"{self.api_base_url}/api/StopTask",
+            response = self.http.post(
+                self._api_urls["StopTask"],
                 json=payload,
                 timeout=30,
                 headers=self.api_headers
             )
+            # 任务状态可能已改变，丢弃缓存的任务详情
+            self._status_cache = None
             response.raise_for_status()
             data = response.json()
             
@@ -253,12 +280,14 @@ class MixerController(RestAPIControlledDevice):
         try:
             payload = {"task_id": task_id}
 
-            response = requests.post(
-                f"{self.api_base_url}/api/CancelTask",
+            response = self.http.post(
+                self._api_urls["CancelTask"],
                 json=payload,
                 timeout=30,
                 headers=self.api_headers
             )
+            # 任务状态可能已改变，丢弃缓存的任务详情
+            self._status_cache = None
             response.raise_for_status()
             data = response.json()
             
@@ -295,30 +324,39 @@ class MixerController(RestAPIControlledDevice):
             self.result = {"status": "error", "message": "没有当前任务"}
             return self.result
 
+    def _get_current_task_info(self) -> Dict[str, Any]:
+        """获取当前任务详情，STATUS_CACHE_TTL 内重复查询直接返回缓存，避免高频轮询时每次都请求设备"""
+        task_id = self.current_task_id
+        cached = self._status_cache
+        if cached is not None and cached[1] == task_id and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+            return cached[2]
+        task_info = self.get_task_info(task_id)
+        if task_info.get("status") != "error":
+            self._status_cache = (time.monotonic(), task_id, task_info)
+        return task_info
+
     def get_status(self) -> dict:
         """获取设备状态"""
-        status_info = {
-            "name": self.device_name,
-            "connected": self.is_connected,
-            "current_task_id": self.current_task_id,
-            "current_task_status": self.current_task_status
-        }
+        status_info = self._status_static.copy()
+        status_info["connected"] = self.is_connected
+        status_info["current_task_id"] = self.current_task_id
+        status_info["current_task_status"] = self.current_task_status
         
         # 如果有当前任务，获取详细信息
         if self.current_task_id:
             try:
-                task_info = self.get_task_info(self.current_task_id)
+                task_info = self._get_current_task_info()
                 if "status" not in task_info.get("status", {}):
                     status_info["task_info"] = task_info
-            except:
+            except Exception:
                 pass
         
         return status_info
 
     def get_result(self) -> dict:
         """获取设备结果"""
-        if self.current_task_id: 
-            self.get_task_info(self.current_task_id)
+        if self.current_task_id:
+            self._get_current_task_info()
         return self.result if self.result else {
             "status": "idle",
             "message": "无操作结果"
@@ -5,26 +5,35 @@ import json
 import time
 import struct
 
-from .base import SocketControlledDevice
+from .base import SocketControlledDevice, DeviceStatus, DEVICE_POOL
 from schemas.oven import CurvePoint
-import config
+from config import get_settings
+from logger import sys_logger as logger
 
 from schemas.oven import OvenStatus, OvenActionCode, OvenLidActionCode
 
+# 设备元数据（名称、型号、从站号、运行曲线名）在配置变更之间基本不变，做短时缓存；实时PV/SV不缓存
+DEVICE_LIST_TTL = 30.0  # 设备列表缓存时间(秒)
+DEVICE_INFO_TTL = 5.0   # 单设备详细信息缓存时间(秒)
+
 class OvenController(SocketControlledDevice):
     """Socket（ZMQ）控制的高温炉设备"""
+    __slots__ = ('REQ_ADDR', 'SUB_ADDR', 'CTRL_ADDR', 'SUB_TOPIC', 'temperature', 'target_temperature',
+                 'runtime', 'step', 'device_list', 'realtime_data', '_device_list_time', '_device_info_cache',
+                 '_sub_context', '_sub_socket', '_ctrl_context', '_ctrl_socket')
     
     def __init__(self, device_id: str = "01", 
                  req_addr: str = None,
                  sub_addr: str = None,
                  ctrl_addr: str = None):
+        settings = get_settings()
         # 从环境变量获取配置，如果没有提供参数则使用默认值
         # 请求地址，用于获取设备列表
-        req_addr = req_addr or config.FURNACE_REQ_ADDR
+        req_addr = req_addr or settings.furnace_req_addr
         # 订阅地址，用于获取实时数据
-        sub_addr = sub_addr or config.FURNACE_SUB_ADDR
+        sub_addr = sub_addr or settings.furnace_sub_addr
         # 控制地址，用于控制炉盖
-        ctrl_addr = ctrl_addr or config.FURNACE_CTRL_ADDR
+        ctrl_addr = ctrl_addr or settings.furnace_ctrl_addr
         # ZMQ Socket通信，使用req_addr作为主地址
         super().__init__("socket_oven_" + device_id, device_id, req_addr)
         self.REQ_ADDR = req_addr
@@ -39,10 +48,13 @@ class OvenController(SocketControlledDevice):
         self.step = 0
         self.device_list = []
         self.realtime_data = {}
-        # 用于SUB socket的临时context（因为SUB socket需要独立管理）
+        # 元数据缓存: 设备列表的获取时间，以及 sid -> (获取时间, 详细信息)
+        self._device_list_time = 0.0
+        self._device_info_cache = {}
+        # SUB socket 所用的context（进程共享的 zmq.Context.instance()，socket单独管理）
         self._sub_context = None
         self._sub_socket = None
-        # 用于CTRL socket的临时context（因为CTRL socket需要独立管理）
+        # CTRL socket 所用的context（进程共享的 zmq.Context.instance()，socket单独管理）
         self._ctrl_context = None
         self._ctrl_socket = None
 
@@ -59,7 +71,9 @@ class OvenController(SocketControlledDevice):
             # 测试连接：获取设备列表
             self.socket.send_string("DeviceDal.GetList@@@")
             data = json.loads(self.socket.recv_string())
-            self.device_list = data if isinstance(data, list) else []
+            self.device_list = [self._normalize_device(d) for d in data] if isinstance(data, list) else []
+            self._device_list_time = time.monotonic()
+            self._device_info_cache.clear()
             
             self.message = "高温炉设备连接成功"
             self.result = {"status": "success", "message": self.message}
@@ -77,65 +91,82 @@ class OvenController(SocketControlledDevice):
         if self._sub_socket:
             try:
                 self._sub_socket.close()
-            except:
+            except zmq.ZMQError:
                 pass
             self._sub_socket = None
-        if self._sub_context:
-            try:
-                self._sub_context.term()
-            except:
-                pass
-            self._sub_context = None
+        self._sub_context = None
         
         # 清理CTRL socket
         if self._ctrl_socket:
             try:
                 self._ctrl_socket.close()
-            except:
+            except zmq.ZMQError:
                 pass
             self._ctrl_socket = None
-        if self._ctrl_context:
-            try:
-                self._ctrl_context.term()
-            except:
-                pass
-            self._ctrl_context = None
+        self._ctrl_context = None
         
         # 调用父类方法清理主socket
         super().disconnect()
         self.message = "高温炉设备已断开连接"
         self.result = {"status": "success", "message": self.message}
 
-    def get_device_list(self):
-        """获取所有设备的基础列表"""
+    @staticmethod
+    def _normalize_device(device: dict) -> dict:
+        """将上位机返回的设备字典统一为规范键名
+        不同版本返回的键名不一致（SlaveID/SlaveId/ID），在加载时一次性解析
+        """
+        sid = int(device.get('SlaveID') or device.get('SlaveId') or device.get('ID') or 0)
+        return {
+            "slave_id": sid,
+            "device_name": device.get('DeviceName') or f"Slave{sid}",
+            "device_type": device.get('DeviceType') or "",
+        }
+
+    def get_device_list(self, use_cache: bool = True):
+        """获取所有设备的基础列表
+        :param use_cache: 是否使用缓存（DEVICE_LIST_TTL 秒内不重复查询）
+        :return: 设备列表，每项为 {"slave_id", "device_name", "device_type"}
+        """
         if not self.is_connected or not self.socket:
             return []
         
+        if use_cache and self.device_list and time.monotonic() - self._device_list_time < DEVICE_LIST_TTL:
+            return self.device_list
+
         try:
             self.socket.send_string("DeviceDal.GetList@@@")
             data = json.loads(self.socket.recv_string())
-            self.device_list = data if isinstance(data, list) else []
+            self.device_list = [self._normalize_device(d) for d in data] if isinstance(data, list) else []
+            self._device_list_time = time.monotonic()
             return self.device_list
         except Exception as e:
             # 如果socket出错，标记为未连接
             self.is_connected = False
             return []
 
-    def get_specific_device_info(self, sid)->dict:
+    def get_specific_device_info(self, sid, use_cache: bool = True)->dict:
         """
         获取特定设备的详细信息
-        用于读取：运行曲线名称、仪表型号等详细字段
+        用于读取：运行曲线名称、仪表型号等详细字段（只含元数据，实时数据见 get_realtime_data）
+        :param use_cache: 是否使用缓存（DEVICE_INFO_TTL 秒内不重复查询）
         """
         if not self.is_connected or not self.socket:
             return {}
         
+        if use_cache:
+            cached = self._device_info_cache.get(sid)
+            if cached and time.monotonic() - cached[0] < DEVICE_INFO_TTL:
+                return cached[1]
+
         try:
             self.socket.send_string(f"DeviceDal.GetList@@@SlaveID = {sid}")
             data = json.loads(self.socket.recv_string())
-            if isinstance(data, list) and len(data) > 0:
-                return data[0]
-            else:
-                return {}
+            info = data[0] if isinstance(data, list) and len(data) > 0 else {}
+            # 运行曲线名同样存在多种键名，缓存前统一到 running_curve
+            if info:
+                info["running_curve"] = info.get('CurrentRunName') or info.get('CurrentRun') or info.get('CurrentWave') or "-"
+            self._device_info_cache[sid] = (time.monotonic(), info)
+            return info
         except Exception as e:
             # 如果socket出错，标记为未连接
             self.is_connected = False
@@ -157,7 +188,7 @@ class OvenController(SocketControlledDevice):
                 self._sub_socket.setsockopt(zmq.SUBSCRIBE, self.SUB_TOPIC)  # 订阅主题
                 self._sub_socket.connect(self.SUB_ADDR)  # 连接到订阅地址
             except Exception as e:
-                print(f"Oven Sub Socket创建失败: {e}")
+                logger.error("Oven Sub Socket创建失败: {}", e)
                 return {}
         
         latest_data = {}
@@ -184,20 +215,15 @@ class OvenController(SocketControlledDevice):
                 except zmq.Again:
                     time.sleep(0.01)
         except Exception as e:
-            print(f"Oven Sub Error: {e}")
+            logger.error("Oven Sub Error: {}", e)
             # SUB socket出错时清理
             if self._sub_socket:
                 try:
                     self._sub_socket.close()
-                except:
+                except zmq.ZMQError:
                     pass
                 self._sub_socket = None
-            if self._sub_context:
-                try:
-                    self._sub_context.term()
-                except:
-                    pass
-                self._sub_context = None
+            self._sub_context = None
         
         self.realtime_data = latest_data
         return latest_data
@@ -295,15 +321,10 @@ class OvenController(SocketControlledDevice):
             if self._ctrl_socket:
                 try:
                     self._ctrl_socket.close()
-                except:
+                except zmq.ZMQError:
                     pass
                 self._ctrl_socket = None
-            if self._ctrl_context:
-                try:
-                    self._ctrl_context.term()
-                except:
-                    pass
-                self._ctrl_context = None
+            self._ctrl_context = None
             return self.result
 
     def control_oven(self, oven_id: int, action_code: OvenActionCode):
@@ -368,19 +389,25 @@ class OvenController(SocketControlledDevice):
         return self.control_oven(oven_id, OvenActionCode.pause)
 
     def get_status(self) -> dict:
-        """获取设备状态"""
-        # 获取实时数据（短时间采样）
-        return self.status
+        """获取设备状态
+        status 为 DeviceStatus 时返回其中文名称（与PLC、XRD控制器一致），否则按原值返回（初始值为整数0）
+        """
+        return self.status.label if isinstance(self.status, DeviceStatus) else self.status
 
     def get_running_status(self) -> dict:
         """获取设备运行状态"""
-        realtime_map = self.get_realtime_data(duration=1.0)
+        # SUB采样窗口(1s)与REQ查询使用不同的socket，两者可以并行：
+        # 在共享线程池中采样实时数据的同时，于当前线程查询设备列表
+        realtime_future = DEVICE_POOL.submit(self.get_realtime_data, 1.0)
         device_list = self.get_device_list()
+        realtime_map = realtime_future.result()
         summary_result = []
+        # 所有设备共用同一个当前时间，结束时间用isoformat格式化(与"%Y-%m-%d %H:%M"输出一致，比strftime快)
+        now = datetime.now()
         for device in device_list:
-            sid = int(device.get('SlaveID') or device.get('SlaveId') or device.get('ID') or 0)
-            name = device.get('DeviceName') or f"Slave{sid}"
-            dtype = device.get('DeviceType') or ""
+            sid = device['slave_id']
+            name = device['device_name']
+            dtype = device['device_type']
             rt_data = realtime_map.get(sid)
             item = {
                 "设备名称": name, 
@@ -394,15 +421,16 @@ class OvenController(SocketControlledDevice):
                 "状态": None
             }
             if rt_data:
+                # 只为有实时数据（在线）的设备查询详细信息，离线设备的结果不会被使用
                 device_info = self.get_specific_device_info(sid)
-                item["运行曲线"] = device_info.get('CurrentRunName') or device_info.get('CurrentRun') or device_info.get('CurrentWave') or "-"
+                item["运行曲线"] = device_info.get('running_curve', "-")
                 item["在线状态"] = "在线"
                 item["实际温度"] = rt_data['pv']
                 item["设定温度"] = rt_data['sv']
                 item["状态"] = "停止" if rt_data['status'] == 1 else "开始"
                 minutes_remaining = rt_data['runtime_raw']
                 if dtype == "858P": minutes_remaining /= 10.0
-                item["结束时间"] = (datetime.now() + timedelta(minutes=minutes_remaining)).strftime("%Y-%m-%d %H:%M") if minutes_remaining > 0 else "-"
+                item["结束时间"] = (now + timedelta(minutes=minutes_remaining)).isoformat(sep=' ', timespec='minutes') if minutes_remaining > 0 else "-"
                 item["状态显示"] = f"阶段{rt_data['step']} 剩余{minutes_remaining / 60.0:.1f}h"
 
                 summary_result.append(item)
@@ -1,15 +1,40 @@
 import time
-from .base import PLCControlledDevice
-import config
+import struct
+import threading
+from .base import PLCControlledDevice, Area, SNAP7_AVAILABLE, PLC_ERRORS, BYTE_BITS as _BITS
+from config import get_settings
+
+# get_status 一次批量读取的区域: (区域, DB号, 起始字节, 长度)
+_STATUS_READ_SPECS = (
+    (Area.MK, 0, 10, 1),    # M10.0 ~ M10.7 控制信号
+    (Area.DB, 3, 0, 6),     # DB3.0 工号 / DB3.2 工位类型 / DB3.4 数量
+    (Area.DB, 1, 218, 1),   # DB1.218.0 原点状态 / DB1.218.1 夹具状态
+    (Area.DB, 1, 242, 4),   # DB1.242 系统状态
+    (Area.DB, 2, 18, 1),    # DB2.18.4 机器人启动/暂停
+    (Area.DB, 2, 40, 4),    # DB2.40 任务状态
+) if SNAP7_AVAILABLE else ()
+# 上述区域拼接后的布局: M10(1B) + DB3(3x2B) + DB1.218(1B) + DB1.242(4B) + DB2.18(1B) + DB2.40(4B)
+_STATUS_RECORD = struct.Struct('>B3HBIBI')
+# write_task 写入DB3.0起始的任务数据: tid(2字节) st(2字节) qty(2字节)
+_TASK_RECORD = struct.Struct('>3H')
+# DB2.18 影子值的有效期(秒)，超过则翻转前重新读取PLC
+_SHADOW_MAX_AGE = 0.5
 
 class RobotController(PLCControlledDevice):
     """PLC控制的机器人手臂设备"""
+    __slots__ = ('_db2_18_lock', '_db2_18_shadow', '_db2_18_time')
     
     def __init__(self, device_id: str = "01", plc_ip: str = None, plc_port: int = None):
+        settings = get_settings()
         # 从环境变量获取配置，如果没有提供参数则使用默认值
-        plc_ip = plc_ip or config.PLC_IP
-        plc_port = plc_port or config.PLC_PORT
+        plc_ip = plc_ip or settings.plc_ip
+        plc_port = plc_port or settings.plc_port
         super().__init__("plc_robot_arm_" + device_id, device_id, plc_ip, plc_port)
+        self.read_cache_ms = settings.plc_read_cache_ms
+        # DB2.18 字节的本地影子值，由 get_status（后台轮询）刷新，翻转时省去一次读取
+        self._db2_18_lock = threading.Lock()
+        self._db2_18_shadow = None
+        self._db2_18_time = 0.0  # 影子值对应的时刻(monotonic)
 
     def get_status(self) -> dict:
         """获取 PLC 连接及机器人状态。
@@ -23,26 +48,32 @@ class RobotController(PLCControlledDevice):
          DB1.218.1 (夹具状态) - 1=打开。
          DB1.242 (系统状态) - 0=断线, 1=空闲, 2=执行中, 3=完成, 4=失败。
          DB2.40 (任务状态) - 0=无任务, 1=有任务。"""
-        if not self.is_connected:
+        read_time = time.monotonic()
+        blocks = self.read_multi(_STATUS_READ_SPECS) if self.is_connected else None
+        if blocks is None:
             return {
                 "name": self.device_name,
                 "connected": False,
                 "message": "设备未连接"
             }
+        m10, tid, st, qty, db1_218, sys_status, db2_18, task_status = _STATUS_RECORD.unpack(b''.join(blocks))
+        db1_218_bits = _BITS[db1_218]
+        self._update_db2_18_shadow(db2_18, read_time)
+        self.update_m_cache(10, m10, read_time)
         return {
         "PLC连接状态": self.is_connected,
-        "M 区控制信号状态": [self.read_m(10, i) for i in range(7)],
+        "M 区控制信号状态": list(_BITS[m10][:7]),
         "任务数据": {
-            "工号": self.read_db_int(3, 0),
-            "工位类型/炉号": self.read_db_int(3, 2),
-            "数量": self.read_db_int(3, 4)
+            "工号": tid,
+            "工位类型/炉号": st,
+            "数量": qty
         },
         "robot": {
-            "原点状态": self.read_db_bit(1, 218, 0),
-            "夹具状态": self.read_db_bit(1, 218, 1),
-            "系统状态": self.read_db_int(1, 242, 4),
-            "机器人启动/暂停": self.read_db_bit(2, 18, 4),
-            "任务状态": self.read_db_int(2, 40, 4)
+            "原点状态": db1_218_bits[0],
+            "夹具状态": db1_218_bits[1],
+            "系统状态": sys_status,
+            "机器人启动/暂停": _BITS[db2_18][4],
+            "任务状态": task_status
         }
     }
 
@@ -87,16 +118,60 @@ class RobotController(PLCControlledDevice):
         """机器人启动/暂停
         对应 DB2.18.4 (机器人启动/暂停)。反转控制，切换机器人的运行/暂停状态。
         """
-        if not self.connect():
+        if not self._ensure_connected():
             return False
-        d = self.read_db_bytes(2, 18, 1)
-        v = bytearray(d)
-        if (v[0] >> 4) & 1:
-            v[0] &= ~(1 << 4)
-        else:
-            v[0] |= (1 << 4)
-        self.write_db_bytes(2, 18, v)
-        return True
+        with self._db2_18_lock:
+            current = self._db2_18_shadow
+            # 影子值缺失或过期时才读取PLC，否则只需一次写入
+            if current is None or time.monotonic() - self._db2_18_time > _SHADOW_MAX_AGE:
+                d = self.read_db_bytes(2, 18, 1)
+                if not d:
+                    return False
+                current = d[0]
+            new = current ^ (1 << 4)
+            # 只写DB2.18.4一个位，不覆盖同字节的其他信号（如DB2.18.0复位）
+            try:
+                self._write_bit(Area.DB, 2, 18, 4, bool((new >> 4) & 1))
+                success = True
+            except PLC_ERRORS:
+                self._mark_failed()
+                success = False
+            if success:
+                self._db2_18_shadow = new
+                self._db2_18_time = time.monotonic()
+            else:
+                self._db2_18_shadow = None
+            return success
+
+    def write_db_int(self, db, byte, value, size=1):
+        """写入DB区数据，覆盖DB2.18时同时作废影子值（如复位点动整字节写入1/0会清掉DB2.18.4）"""
+        try:
+            return super().write_db_int(db, byte, value, size)
+        finally:
+            self._drop_db2_18_shadow(db, byte, size)
+
+    def write_db_bytes(self, db, byte, value: bytearray):
+        """写入DB区字节数据，覆盖DB2.18时同时作废影子值"""
+        try:
+            return super().write_db_bytes(db, byte, value)
+        finally:
+            self._drop_db2_18_shadow(db, byte, len(value))
+
+    def _drop_db2_18_shadow(self, db, byte, size):
+        """写入范围覆盖DB2.18时作废影子值，并把写入时刻记为现在，拒绝写入完成前开始的读数"""
+        if db == 2 and byte <= 18 < byte + size:
+            with self._db2_18_lock:
+                self._db2_18_shadow = None
+                self._db2_18_time = time.monotonic()
+
+    def _update_db2_18_shadow(self, value: int, read_time: float):
+        """刷新DB2.18影子值
+        只接受读取开始时刻晚于最近一次写入的读数，防止旧读数覆盖刚写入的值
+        """
+        with self._db2_18_lock:
+            if read_time >= self._db2_18_time:
+                self._db2_18_shadow = value
+                self._db2_18_time = read_time
 
     def toggle_m_10(self, bit: int):
         """翻转M10.x区信号。
@@ -107,7 +182,7 @@ class RobotController(PLCControlledDevice):
         - M10.3 开高温炉盖  标签1   反转控制
         - M10.4 开离心机门  标签2   反转控制
         - M10.5	机器人停止	标签13	反转控制。"""
-        if not self.connect():
+        if not self._ensure_connected():
             return False
         return self.toggle_m(10, bit)
 
@@ -115,7 +190,7 @@ class RobotController(PLCControlledDevice):
         """下发任务
         - M10.0 是启动信号
         """
-        if not self.connect():
+        if not self._ensure_connected():
             return False
         return self.pulse_m(10, 0)
 
@@ -125,12 +200,13 @@ class RobotController(PLCControlledDevice):
         - st: 站点 DB3.2
         - qty: 生产数量 DB3.4
         """
-        if not self.connect():
+        if not self._ensure_connected():
+            return False
+        # 设置数据 (tid任务id/st站点/qty生产数量)，三个字段地址连续，一次写入
+        try:
+            data = _TASK_RECORD.pack(int(tid), int(st), int(qty))
+        except struct.error:
             return False
-        # 设置数据 (tid任务id/st站点/qty生产数量)
-        self.write_db_int(3, 0, tid, size=2)
-        self.write_db_int(3, 2, st, size=2)
-        self.write_db_int(3, 4, qty, size=2)
-        return True
+        return self.write_db_bytes(3, 0, data)
 
 robot_controller = RobotController()
\ No newline at end of file
@@ -9,26 +9,30 @@ import struct
 import time
 from typing import Dict, Any, Optional
 from .base import BaseDevice
-import config
+from config import get_settings
 
 
 class XRDController(BaseDevice):
     """XRD衍射仪设备（TCP Socket控制）"""
+    __slots__ = ('host', 'port', 'socket', 'socket_timeout', 'xrd_status_cache', '_status_static')
     
     def __init__(self, device_id: str = "01",
                  host: str = None,
                  port: int = None,
                  timeout: int = None):
+        settings = get_settings()
         # 从环境变量获取配置
-        host = host or config.XRD_HOST
-        port = port or config.XRD_PORT
-        timeout = timeout or config.XRD_TIMEOUT
+        host = host or settings.xrd_host
+        port = port or settings.xrd_port
+        timeout = timeout or settings.xrd_timeout
         super().__init__("socket_xrd_" + device_id, "Socket", device_id)
         self.host = host
         self.port = port
         self.socket = None  # TCP Socket对象
         self.socket_timeout = timeout  # Socket超时时间（秒）
         self.xrd_status_cache = {}
+        # get_status 中不会变化的字段，初始化时生成一次
+        self._status_static = {"name": self.device_name, "host": self.host, "port": self.port}
 
     def _send_command(self, command: str, content: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -140,7 +144,7 @@ class XRDController(BaseDevice):
             if self.socket:
                 try:
                     self.socket.close()
-                except:
+                except OSError:
                     pass
                 self.socket = None
             return False
@@ -150,7 +154,7 @@ class XRDController(BaseDevice):
             if self.socket:
                 try:
                     self.socket.close()
-                except:
+                except OSError:
                     pass
                 self.socket = None
             return False
@@ -160,7 +164,7 @@ class XRDController(BaseDevice):
         if self.socket:
             try:
                 self.socket.close()
-            except:
+            except OSError:
                 pass
             self.socket = None
         self.is_connected = False
@@ -342,13 +346,9 @@ class XRDController(BaseDevice):
 
     def get_status(self) -> dict:
         """获取设备状态"""
-        status_info = {
-            "name": self.device_name,
-            "connected": self.is_connected,
-            "host": self.host,
-            "port": self.port,
-            "status": self.status.value if self.status else "unknown"
-        }
+        status_info = self._status_static.copy()
+        status_info["connected"] = self.is_connected
+        status_info["status"] = self.status.label if self.status is not None else "unknown"
         
         # 如果已连接，获取详细状态
         if self.is_connected:
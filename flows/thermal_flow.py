@@ -221,7 +221,7 @@ class ThermalFlowManager:
                 self.logger.log(f"严重错误: 机器人启动信号发送失败，流程终止", "ERROR")
                 continue
 
-            print(f"PLC任务 {task['desc']} 已启动，等待完成及回原点...")
+            logger.info("PLC任务 {} 已启动，等待完成及回原点...", task['desc'])
 
             # ===============================================
             # 新增步骤：必须先确认为"运行中"，防止假完成
@@ -278,20 +278,21 @@ class ThermalFlowManager:
                 # 任务3,4 (Cent) 需要 M10.4 (Cent)
                 try:
                     if self.robot_controller.connect():
-                        v = self.robot_controller.read_m_bytes(10)
-
+                        # 按位写入，不读-改-写整个M10字节：dispatch_task 的M10.0点动复位在后台定时执行，
+                        # 整字节写回可能把读到的M10.0=1重新写入，使启动信号一直保持
                         if task['auto_device'] == 'oven_complex':
                             # 置位 M10.2 (Bit 2) 和 M10.3 (Bit 3)
-                            v[0] |= (1 << 2)
-                            v[0] |= (1 << 3)
-                            self.logger.log("已发送: 炉门/盖开启确认信号 (M10.2/M10.3)", "INFO")
+                            if self.robot_controller.set_m(10, 2, True) and self.robot_controller.set_m(10, 3, True):
+                                self.logger.log("已发送: 炉门/盖开启确认信号 (M10.2/M10.3)", "INFO")
+                            else:
+                                self.logger.log("发送炉门/盖开启确认信号失败 (M10.2/M10.3)", "ERROR")
 
                         elif task['auto_device'] == 'cent':
                             # 置位 M10.4 (Bit 4)
-                            v[0] |= (1 << 4)
-                            self.logger.log("已发送: 离心机门开启确认信号 (M10.4)", "INFO")
-
-                        self.robot_controller.write_m_bytes(10, v)
+                            if self.robot_controller.set_m(10, 4, True):
+                                self.logger.log("已发送: 离心机门开启确认信号 (M10.4)", "INFO")
+                            else:
+                                self.logger.log("发送离心机门开启确认信号失败 (M10.4)", "ERROR")
                 except Exception as e:
                     self.logger.log(f"发送PLC许可信号失败: {e}", "ERROR")
 
@@ -344,14 +345,10 @@ class ThermalFlowManager:
             if task.get('auto_device'):
                 try:
                     if self.robot_controller.connect():
-                        d = self.robot_controller.read_m_bytes(10, 1)
-                        v = bytearray(d)
-                        # 复位 M10.2, M10.3, M10.4
-                        v[0] &= ~(1 << 2)
-                        v[0] &= ~(1 << 3)
-                        v[0] &= ~(1 << 4)
-                        self.robot_controller.write_m_bytes(10, v)
-                except:
+                        # 复位 M10.2, M10.3, M10.4（按位写入，不影响M10.0等其他信号）
+                        for bit in (2, 3, 4):
+                            self.robot_controller.set_m(10, bit, False)
+                except Exception:
                     pass
 
             # ===============================================
@@ -1,16 +1,47 @@
 import time
+import asyncio
+import threading
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, List
 from loguru import logger
 import sys
 
+from config import get_settings
+
+# 日志级别序号：低于 log_level 的日志不写控制台/文件，低于 log_buffer_level 的不进入前端缓冲区；
+# 两者都低于时在格式化之前直接丢弃
+_LEVEL_NO = {"DEBUG": 10, "INFO": 20, "SUCCESS": 25, "WARN": 30, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+# 内存中保留的日志条数（供前端显示）
+LOG_BUFFER_SIZE = 5000
+# 每个推送订阅者最多积压的日志条数，超过时丢弃最旧的
+LOG_SUBSCRIBER_QUEUE_SIZE = 1000
+
 
 # ==========================================
 # 新增: 日志管理器 (用于前端显示和loguru集成)
 # ==========================================
 class SystemLogger:
     def __init__(self):
-        self.logs = []
+        # 最新的日志在最前面；seq 为单调递增的日志序号
+        self.logs = deque(maxlen=LOG_BUFFER_SIZE)
+        self.seq = 0
+        self._lock = threading.Lock()
+        # 日志推送订阅者: 队列 -> 所属事件循环（log 可能在其他线程调用，需线程安全地投递）
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self.level = get_settings().log_level.upper()
+        self.level_no = _LEVEL_NO.get(self.level, 20)
+        # 前端日志缓冲区及推送订阅者的级别（默认DEBUG，即全部保留），与控制台/文件级别分开
+        self.buffer_level_no = _LEVEL_NO.get(get_settings().log_buffer_level.upper(), 10)
+        # 级别 -> loguru记录方法（未列出的级别作为info处理）
+        self._emitters = {
+            "INFO": logger.info,
+            "WARNING": logger.warning,
+            "WARN": logger.warning,
+            "ERROR": logger.error,
+            "DEBUG": logger.debug,
+            "CRITICAL": logger.critical,
+        }
 
         # 配置loguru日志记录到控制台和文件
         logger.remove()  # 移除默认处理器
@@ -18,7 +49,8 @@ class SystemLogger:
         logger.add(
             sys.stdout,
             format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-            level="INFO"
+            level=self.level,
+            enqueue=True                       # 异步写入，控制台输出不阻塞请求
         )
         
         # 2. 文件输出
@@ -27,52 +59,101 @@ class SystemLogger:
             rotation="10 MB",                  # 单个文件达到10MB时滚动
             retention="10 days",               # 保留10天日志
             format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
+            level=self.level,
             encoding="utf-8",                  # 新增：指定编码，避免中文乱码
             compression="zip",                 # 新增：过期日志自动压缩，节省空间
             enqueue=True                       # 新增：异步写入，避免阻塞程序
         )
 
-    def log(self, msg: str, level: str = "INFO"):
-        """记录日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        entry = {"time": timestamp, "level": level, "msg": msg}
-        # 插入到最前面，保留最近50条
-        self.logs.insert(0, entry)
-        if len(self.logs) > 50:
-            self.logs.pop()
+    def log(self, msg: str, level: str = "INFO", *args):
+        """记录日志
+        :param msg: 日志内容，可使用 {} 占位符，由 args 延迟填充（缓冲区和控制台/文件都不需要时不做格式化）
+        :param level: 日志级别
+        """
+        level = level.upper()
+        level_no = _LEVEL_NO.get(level, 20)
+        emitted = level_no >= self.level_no
+        buffered = level_no >= self.buffer_level_no
+        if not (emitted or buffered):
+            return
+        if args:
+            msg = msg.format(*args)
+        if buffered:
+            self._buffer(msg, level)
 
         # 使用loguru记录日志
-        if level.upper() == "INFO":
-            logger.info(msg)
-        elif level.upper() == "WARNING" or level.upper() == "WARN":
-            logger.warning(msg)
-        elif level.upper() == "ERROR":
-            logger.error(msg)
-        elif level.upper() == "DEBUG":
-            logger.debug(msg)
-        elif level.upper() == "CRITICAL":
-            logger.critical(msg)
-        else:
-            logger.info(f"[{level}] {msg}")  # 默认作为info处理
-
-    def info(self, msg: str):
+        if emitted:
+            emit = self._emitters.get(level)
+            if emit:
+                emit(msg)
+            else:
+                logger.info(f"[{level}] {msg}")  # 默认作为info处理
+
+    def _buffer(self, msg: str, level: str):
+        """写入前端日志缓冲区并推送给订阅者"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        with self._lock:
+            self.seq += 1
+            entry = {"seq": self.seq, "time": timestamp, "level": level, "msg": msg}
+            # 插入到最前面，超过 LOG_BUFFER_SIZE 条时自动丢弃最旧的
+            self.logs.appendleft(entry)
+            subscribers = list(self._subscribers.items())
+
+        # 推送给订阅者
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, entry)
+            except RuntimeError:
+                # 事件循环已关闭
+                self.unsubscribe(queue)
+
+    def get_logs(self, since: int = 0, limit: int = 50) -> list[dict]:
+        """获取序号大于 since 的日志（最新的在前），最多 limit 条"""
+        entries = []
+        with self._lock:
+            for entry in self.logs:
+                if entry["seq"] <= since or len(entries) >= limit:
+                    break
+                entries.append(entry)
+        return entries
+
+    def subscribe(self) -> asyncio.Queue:
+        """订阅新日志（需在事件循环中调用），返回接收日志条目的队列"""
+        queue = asyncio.Queue(maxsize=LOG_SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """取消订阅"""
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, entry: dict):
+        """在事件循环线程中投递日志，消费过慢时丢弃最旧的"""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(entry)
+
+    def info(self, msg: str, *args):
         """记录信息日志"""
-        self.log(msg, "INFO")
+        self.log(msg, "INFO", *args)
 
-    def warning(self, msg: str):
+    def warning(self, msg: str, *args):
         """记录警告日志"""
-        self.log(msg, "WARNING")
+        self.log(msg, "WARNING", *args)
 
-    def error(self, msg: str):
+    def error(self, msg: str, *args):
         """记录错误日志"""
-        self.log(msg, "ERROR")
+        self.log(msg, "ERROR", *args)
 
-    def debug(self, msg: str):
+    def debug(self, msg: str, *args):
         """记录调试日志"""
-        self.log(msg, "DEBUG")
+        self.log(msg, "DEBUG", *args)
 
-    def critical(self, msg: str):
+    def critical(self, msg: str, *args):
         """记录严重错误日志"""
-        self.log(msg, "CRITICAL")
+        self.log(msg, "CRITICAL", *args)
 
 sys_logger = SystemLogger()
\ No newline at end of file
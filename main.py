@@ -1,7 +1,11 @@
 import uvicorn
 from app import app
-import config  # 导入配置模块以加载环境变量
+from config import get_settings
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=config.APP_HOST, port=config.APP_PORT)
\ No newline at end of file
+    settings = get_settings()
+    # 多进程模式下 uvicorn 需要以导入字符串的形式加载应用，由每个工作进程各自导入
+    target = "app:app" if settings.app_workers > 1 else app
+    uvicorn.run(target, host=settings.app_host, port=settings.app_port,
+                loop=settings.app_loop, http=settings.app_http, workers=settings.app_workers)
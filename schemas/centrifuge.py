@@ -1,5 +1,5 @@
 from typing import Optional, Literal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .base import BaseResponse
 
@@ -40,6 +40,8 @@ class CentrifugeActionRequest(BaseModel):
         return v
 
 class CentrifugeStatus(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     actual_rpm: int = Field(..., description="当前转速 RPM", example=1000)
     centrifuge_force: int = Field(..., description="实际离心力", example=1000)
     run_time: int = Field(..., description="运行时间", example=1000)
@@ -53,4 +55,4 @@ class CentrifugeStatus(BaseModel):
     remain_time: str = Field(..., description="剩余时间 格式: HH:MM:SS", example="00:00:00")
 
 class CentrifugeStatusResponse(BaseResponse):
-    data: Optional[dict] = Field(default=None, description="数据")
+    data: Optional[CentrifugeStatus] = Field(default=None, description="离心机状态数据")
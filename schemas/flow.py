@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class ThermalLoadRequest(BaseModel):
+    shelf_id: int = Field(..., description="货架号", example=1)
+    oven_id: int = Field(..., description="炉子号", example=1)
+    qty: int = Field(..., description="数量", example=1)
+
+class ThermalUnloadRequest(BaseModel):
+    oven_id: int = Field(..., description="炉子号", example=1)
+    slot_id: int = Field(..., description="穴位号", example=1)
+    shelf_id: int = Field(..., description="货架号", example=1)
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from uuid import uuid4
+
+from schemas.mixer import MixerTaskModel
+from flows.thermal_flow import thermal_flow_mgr
+from flows.mix_flow import mix_flow_mgr
+from flows.xrd_flow import xrd_flow_mgr
+from logger import sys_logger as logger
+
+# 最多保留的试验任务记录数，超过时从最早结束的任务开始移除（执行中的任务不会被移除）
+EXPERIMENT_TASK_LIMIT = 200
+# 已结束任务记录的保留时间(秒)，超过后移除
+EXPERIMENT_TASK_TTL = 24 * 3600
+
+
+class ExperimentService:
+    """
+    试验任务服务
+    试验流程耗时很长，由后台任务执行，接口只返回任务ID，通过任务ID查询进度
+    """
+    def __init__(self):
+        # task_id -> 任务状态记录
+        self.tasks: dict[str, dict] = {}
+        # 已结束的任务: task_id -> 结束时刻(monotonic)，按结束先后排列，用于淘汰旧记录
+        self._finished: OrderedDict[str, float] = OrderedDict()
+
+    def create_task(self, task_name: str) -> str:
+        """登记一个新试验任务，返回任务ID"""
+        task_id = uuid4().hex
+        self.tasks[task_id] = {
+            "task_id": task_id,
+            "task_name": task_name,
+            "status": "pending",
+            "step": "等待执行",
+            "message": "",
+            "created_at": datetime.now().isoformat(sep=' ', timespec='seconds'),
+            "finished_at": None
+        }
+        self._prune()
+        return task_id
+
+    def get_task(self, task_id: str) -> dict | None:
+        """查询试验任务状态"""
+        return self.tasks.get(task_id)
+
+    def _update(self, task_id: str, **fields):
+        task = self.tasks.get(task_id)
+        if task is not None:
+            task.update(fields)
+
+    def _finish(self, task_id: str, **fields):
+        """标记任务结束，之后该记录可被淘汰"""
+        self._update(task_id, finished_at=datetime.now().isoformat(sep=' ', timespec='seconds'), **fields)
+        if task_id in self.tasks:
+            self._finished[task_id] = time.monotonic()
+        self._prune()
+
+    def _prune(self):
+        """移除超过保留时间、或记录数超过上限时最早结束的任务"""
+        now = time.monotonic()
+        while self._finished:
+            task_id, finished = next(iter(self._finished.items()))
+            if len(self.tasks) <= EXPERIMENT_TASK_LIMIT and now - finished < EXPERIMENT_TASK_TTL:
+                break
+            del self._finished[task_id]
+            self.tasks.pop(task_id, None)
+
+    async def run_pipeline(self, task_id: str, mixer_model: MixerTaskModel):
+        """
+        执行试验流程
+        1. 配料
+        2. 熔封
+        3. 热处理（高温炉、离心机）
+        4. xrd衍射仪
+        各工序均为阻塞调用，放到线程中执行
+        """
+        try:
+            #########################################################
+            # 1. 配料 #
+            #########################################################
+            self._update(task_id, status="running", step="配料")
+            await asyncio.to_thread(mix_flow_mgr.run, mixer_model)
+
+            #########################################################
+            # 2. 熔封 #
+            #########################################################
+
+            # TODO API为完成，人工确认熔封完成
+
+            #########################################################
+            # 3. 热处理 # 包括高温炉、离心机工序
+            #########################################################
+            self._update(task_id, step="热处理")
+            await asyncio.to_thread(thermal_flow_mgr.run)
+
+            #########################################################
+            # 4. xrd衍射仪 #
+            #########################################################
+            self._update(task_id, step="XRD衍射")
+            await asyncio.to_thread(xrd_flow_mgr.run)
+
+            self._finish(task_id, status="success", step="完成", message="试验流程执行完成")
+            logger.log(f"试验任务{task_id}执行完成", "SUCCESS")
+        except Exception as e:
+            self._finish(task_id, status="error", message=f"试验流程执行失败: {str(e)}")
+            logger.log(f"试验任务{task_id}执行失败: {str(e)}", "ERROR")
+
+
+# 创建全局服务实例
+experiment_service = ExperimentService()
@@ -0,0 +1,57 @@
+import asyncio
+
+from logger import sys_logger as logger
+
+
+class DeviceKeepAlive:
+    """
+    设备连接保活服务
+    每个设备一个后台任务，断线后按指数退避自动重连，接口调用时不再需要先检查/建立连接
+    """
+    def __init__(self, check_interval: float = 1.0, max_backoff: float = 30.0):
+        self.check_interval = check_interval  # 连接正常时的检查间隔(秒)
+        self.max_backoff = max_backoff        # 重连失败时的最大退避时间(秒)
+        self._tasks: list[asyncio.Task] = []
+
+    async def _keepalive(self, controller, name: str):
+        """单个设备的保活循环"""
+        backoff = self.check_interval
+        while True:
+            if controller.is_connected:
+                backoff = self.check_interval
+                await asyncio.sleep(self.check_interval)
+                continue
+            try:
+                ok = await asyncio.wrap_future(controller.connect_async())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                ok = False
+                controller.message = str(e)
+            if ok:
+                logger.log(f"{name}重连成功", "SUCCESS")
+                backoff = self.check_interval
+            else:
+                # 只在第一次失败时记录，避免退避期间日志刷屏
+                if backoff == self.check_interval:
+                    logger.log(f"{name}已断开，开始自动重连: {controller.get_message()}", "WARN")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def start(self, controllers: list[tuple]):
+        """为每个设备启动保活任务（需在事件循环中调用）
+        :param controllers: [(设备名称, controller), ...]
+        """
+        for name, controller in controllers:
+            self._tasks.append(asyncio.create_task(self._keepalive(controller, name)))
+
+    async def stop(self):
+        """停止所有保活任务"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+# 创建全局服务实例
+device_keepalive = DeviceKeepAlive()
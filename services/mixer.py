@@ -1,21 +1,64 @@
 import pandas as pd
+import asyncio
+import hashlib
+import importlib.util
 import io
-from typing import Any
+from collections import OrderedDict
+from typing import Any, BinaryIO
 from schemas.mixer import MixerTaskModel
 
+# 安装了 python-calamine 时使用 calamine 引擎解析Excel（比openpyxl快很多，同时支持xlsx/xls）
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+# 解析结果缓存条数（按文件内容哈希）
+PARSE_CACHE_SIZE = 16
+
+
+def _file_digest(f: BinaryIO) -> str:
+    """按块计算文件内容的blake2b哈希，计算完成后回到文件开头"""
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: f.read(1 << 20), b''):
+        h.update(chunk)
+    f.seek(0)
+    return h.hexdigest()
+
 
 class MixerService:
     """
     配料任务处理服务
     """
-    async def parse_mixer_tasks_from_excel(self, excel_contents: bytes) -> MixerTaskModel:
+    def __init__(self):
+        # 内容哈希 -> 解析结果，重复上传同一文件时不再重新解析
+        self._parse_cache: OrderedDict[str, MixerTaskModel] = OrderedDict()
+
+    async def parse_mixer_tasks_from_excel(self, excel_file: bytes | BinaryIO) -> MixerTaskModel:
         """
         从Excel内容解析配料任务
-        :param excel_contents: Excel文件的字节内容
+        解析为CPU密集操作，放到线程中执行，避免阻塞事件循环
+        :param excel_file: Excel文件的字节内容，或可读的二进制文件对象（如上传文件的临时文件）
         :return: 解析后的MixerTaskModel对象
         """
-        # 将字节内容转换为DataFrame
-        df = pd.read_excel(io.BytesIO(excel_contents))
+        return await asyncio.to_thread(self._parse_excel, excel_file)
+
+    def _parse_excel(self, excel_file: bytes | BinaryIO) -> MixerTaskModel:
+        """解析Excel（同步），按内容哈希缓存结果"""
+        # 文件对象直接交给pandas读取，避免先整体读入内存
+        source = io.BytesIO(excel_file) if isinstance(excel_file, (bytes, bytearray)) else excel_file
+        digest = _file_digest(source)
+        cached = self._parse_cache.get(digest)
+        if cached is not None:
+            self._parse_cache.move_to_end(digest)
+            return cached.model_copy(deep=True)
+
+        df = pd.read_excel(source, engine=EXCEL_ENGINE)
+        mixer_model = self._build_task_model(df)
+
+        self._parse_cache[digest] = mixer_model.model_copy(deep=True)
+        if len(self._parse_cache) > PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
+        return mixer_model
+
+    def _build_task_model(self, df: pd.DataFrame) -> MixerTaskModel:
+        """将Excel数据转换为MixerTaskModel对象"""
         
         # 解析Excel数据为MixerTaskModel对象
         # 这里需要根据Excel的实际结构来解析数据
@@ -1,7 +1,7 @@
 from devices.oven_core import oven_controller
 from schemas.oven import OvenCurveRequest, CurvePoint, OvenCurveListItem
 import sqlite3
-import config
+from config import get_settings
 import json
 
 from logger import sys_logger as logger
@@ -13,7 +13,7 @@ class OvenService:
 
     def persist_oven_curve(self, oven_id: int, curve_name: str, points: list[CurvePoint]):
         try:
-            with sqlite3.connect(config.FURNACE_DB_PATH) as conn:
+            with sqlite3.connect(get_settings().furnace_db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("INSERT INTO saved_curves (oven_id, curve_name, points_json) VALUES (?, ?, ?)", 
                 (oven_id, curve_name, json.dumps([p.model_dump() for p in points])))
@@ -26,7 +26,7 @@ class OvenService:
 
     def get_oven_curve_by_oven_id(self, oven_id: int) -> list[CurvePoint]:
         try:
-            with sqlite3.connect(config.FURNACE_DB_PATH) as conn:
+            with sqlite3.connect(get_settings().furnace_db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT points_json FROM saved_curves WHERE oven_id = ?", (oven_id,))
                 row = cursor.fetchone()
@@ -38,7 +38,7 @@ class OvenService:
 
     def get_oven_curve_by_name(self, curve_name: str) -> list[CurvePoint]:
         try:
-            with sqlite3.connect(config.FURNACE_DB_PATH) as conn:
+            with sqlite3.connect(get_settings().furnace_db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT points_json FROM saved_curves WHERE curve_name = ?", (curve_name,))
                 row = cursor.fetchone()
@@ -50,7 +50,7 @@ class OvenService:
 
     def get_oven_curve_list(self) -> list[OvenCurveListItem]:
         try:
-            with sqlite3.connect(config.FURNACE_DB_PATH) as conn:
+            with sqlite3.connect(get_settings().furnace_db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, curve_name, save_time FROM saved_curves ORDER BY save_time DESC")
                 rows =  cursor.fetchall()
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from config import get_settings
+from devices.robot_core import robot_controller
+from logger import sys_logger as logger
+
+
+@dataclass(slots=True)
+class PlcSnapshot:
+    """PLC状态快照"""
+    status: dict       # robot_controller.get_status() 的结果
+    timestamp: float   # 采集时刻 time.monotonic()
+
+
+class PlcStatusPoller:
+    """
+    PLC状态后台轮询服务
+    后台任务持续读取PLC并发布最新快照，接口直接读取快照，不再在请求中等待PLC往返
+    断线重连由 services.keepalive 负责
+    """
+    def __init__(self, interval: float = None):
+        self.interval = interval or get_settings().plc_poll_interval
+        # 超过该时间未刷新的快照视为过期
+        self.stale_after = max(1.0, self.interval * 10)
+        self.snapshot: PlcSnapshot | None = None
+        # 写入代次：invalidate() 时推进，读取期间代次变化说明读数可能早于写入，不存为快照
+        self._generation = 0
+        self._task: asyncio.Task | None = None
+        # 快照不可用时的直接读取做单飞合并，并发请求只触发一次PLC读取
+        self._read_lock = asyncio.Lock()
+        # 状态推送订阅者（每个SSE连接一个队列，只保留最新一条）
+        self._subscribers: set[asyncio.Queue] = set()
+
+    async def _pump(self):
+        """轮询循环"""
+        previous = None
+        while True:
+            try:
+                generation = self._generation
+                status = await asyncio.to_thread(robot_controller.get_status)
+                # 读取期间有写入时丢弃本次读数，下一轮重新读取
+                if generation == self._generation:
+                    self.snapshot = PlcSnapshot(status, time.monotonic())
+                # 状态变化时才推送给订阅者
+                if generation == self._generation and status != previous:
+                    self._publish(status)
+                    previous = status
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.log(f"PLC状态轮询异常: {str(e)}", "ERROR")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """启动后台轮询（需在事件循环中调用）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._pump())
+
+    async def stop(self):
+        """停止后台轮询"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self) -> asyncio.Queue:
+        """订阅状态变化，返回接收最新状态的队列"""
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """取消订阅"""
+        self._subscribers.discard(queue)
+
+    def _publish(self, status: dict):
+        """向所有订阅者推送最新状态，消费慢的订阅者只保留最新一条"""
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(status)
+
+    def invalidate(self):
+        """丢弃当前快照并推进写入代次（写入PLC后调用，保证随后的查询能看到最新状态）
+        写入前已开始、写入后才完成的读取不会再被存为快照
+        """
+        self._generation += 1
+        self.snapshot = None
+
+    async def read_status(self, nocache: bool = False) -> dict:
+        """
+        获取PLC状态：优先返回快照，快照不可用时直接读取PLC并刷新快照
+        :param nocache: 为True时忽略快照，强制读取PLC（调试用）
+        """
+        if not nocache:
+            status = self.latest()
+            if status is not None:
+                return status
+        async with self._read_lock:
+            # 等锁期间可能已有其他请求完成了读取
+            if not nocache:
+                status = self.latest()
+                if status is not None:
+                    return status
+            generation = self._generation
+            status = await asyncio.to_thread(robot_controller.get_status)
+            if generation == self._generation:
+                self.snapshot = PlcSnapshot(status, time.monotonic())
+            return status
+
+    def latest(self) -> dict | None:
+        """
+        获取最新的PLC状态
+        :return: 状态字典；尚无快照或快照已过期时返回None
+        """
+        snapshot = self.snapshot
+        if snapshot is None or time.monotonic() - snapshot.timestamp > self.stale_after:
+            return None
+        return snapshot.status
+
+
+class PlcCommandQueue:
+    """
+    PLC写命令队列
+    各接口的写操作（读-改-写）统一入队，由单个后台任务按顺序执行，
+    避免并发请求交错执行导致基于旧值翻转位等问题
+    """
+    def __init__(self):
+        self._queue: asyncio.Queue[tuple[Callable, tuple, asyncio.Future]] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    async def _worker(self):
+        """命令执行循环"""
+        while True:
+            func, args, future = await self._queue.get()
+            try:
+                # 请求方已断开（future被取消）时跳过该命令
+                if future.cancelled():
+                    continue
+                try:
+                    result = await asyncio.to_thread(func, *args)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        """启动命令执行任务（需在事件循环中调用）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        """停止命令执行任务，未执行的命令以异常结束"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("PLC命令队列已停止"))
+
+    async def submit(self, func: Callable, *args):
+        """提交一条命令并等待执行结果
+        :param func: 同步的PLC操作函数，如 robot_controller.toggle_m
+        :return: func 的返回值
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((func, args, future))
+        return await future
+
+    async def pulse_m(self, b: int, i: int) -> bool:
+        """M区点动控制: 置位1 -> 0.5s后复位0
+        作为一条命令入队，执行设备自身的 pulse_m：复位由 pulse_scheduler 定时执行，
+        与请求是否被取消无关，复位失败时登记到重连后补发，不会让信号一直保持为1
+        """
+        return await self.submit(robot_controller.pulse_m, b, i)
+
+    async def pulse_db(self, db: int, byte: int) -> bool:
+        """DB区点动控制: 置位1 -> 0.5s后复位0（复位同样由 pulse_scheduler 执行并在失败时补发）"""
+        return await self.submit(robot_controller.pulse_db, db, byte)
+
+# 创建全局服务实例
+plc_poller = PlcStatusPoller()
+plc_commands = PlcCommandQueue()
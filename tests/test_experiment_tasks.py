@@ -0,0 +1,61 @@
+"""试验任务记录的淘汰及 GET /api/experiment/{task_id} 查询"""
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import services.experiment as experiment
+from apis.experiment_api import router
+
+
+@pytest.fixture
+def service(monkeypatch):
+    svc = experiment.ExperimentService()
+    monkeypatch.setattr(experiment, "experiment_service", svc)
+    monkeypatch.setattr("apis.experiment_api.experiment_service", svc)
+    return svc
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_finished_tasks_evicted_past_limit(service, monkeypatch):
+    monkeypatch.setattr(experiment, "EXPERIMENT_TASK_LIMIT", 2)
+    first = service.create_task("t1")
+    second = service.create_task("t2")
+    service._finish(first, status="success")
+    service._finish(second, status="success")
+    running = service.create_task("t3")
+    # 超过上限时移除最早结束的任务
+    assert service.get_task(first) is None
+    assert service.get_task(second) is not None
+    # 执行中的任务不会被移除
+    service.create_task("t4")
+    assert service.get_task(second) is None
+    assert service.get_task(running) is not None
+
+
+def test_finished_tasks_evicted_after_ttl(service, monkeypatch):
+    task_id = service.create_task("t1")
+    service._finish(task_id, status="error", message="失败")
+    assert service.get_task(task_id)["status"] == "error"
+    monkeypatch.setattr(experiment, "EXPERIMENT_TASK_TTL", 0)
+    service.create_task("t2")
+    assert service.get_task(task_id) is None
+
+
+def test_get_task_status(service, client, monkeypatch):
+    task_id = service.create_task("t1")
+    response = client.get(f"/api/experiment/{task_id}")
+    assert response.status_code == 200
+    assert response.json()["data"]["task_id"] == task_id
+
+    monkeypatch.setattr(experiment, "EXPERIMENT_TASK_TTL", 0)
+    service._finish(task_id, status="success")
+    assert client.get(f"/api/experiment/{task_id}").status_code == 404
+    assert client.get("/api/experiment/unknown").status_code == 404
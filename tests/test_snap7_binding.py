@@ -0,0 +1,16 @@
+"""python-snap7 内部接口检查
+PLCControlledDevice._write_bit 直接调用 Client._lib.Cli_WriteMultiVars(Client._s7_client, ...)
+以取得各数据项的 Result；这些属性不属于公开接口，升级 python-snap7 后若被改名，此测试失败
+"""
+import pytest
+
+snap7 = pytest.importorskip("snap7")
+
+
+def test_client_exposes_write_multi_vars_handles():
+    client = snap7.client.Client()
+    try:
+        assert hasattr(client, "_s7_client")
+        assert hasattr(client._lib, "Cli_WriteMultiVars")
+    finally:
+        client.destroy()
@@ -6,24 +6,29 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List
 import sqlite3
 import os
+from functools import lru_cache
 
-import config
+from config import get_settings
 
+@lru_cache(maxsize=128)
 def cent_format_time(s):
     '''格式化时间'''
     m, s = divmod(s, 60)
     h, m = divmod(m, 60)
     return f"{h:02d}:{m:02d}:{s:02d}" if h > 0 else f"{m:02d}:{s:02d}"
 
-def cent_get_value(data, i):
+_CENT_REGISTER = struct.Struct('>H')
+
+def cent_get_value(data, i, _unpack_from=_CENT_REGISTER.unpack_from):
     '''获取数据'''
-    return struct.unpack('>H', bytes(data[3 + i * 2:3 + i * 2 + 2]))[0]
+    return _unpack_from(data, 3 + i * 2)[0]
 
 def initialize_oven_curve_db():
     """初始化数据库表结构"""
-    if not os.path.exists(config.FURNACE_DB_PATH):
-        os.makedirs(os.path.dirname(config.FURNACE_DB_PATH))
-        with sqlite3.connect(config.FURNACE_DB_PATH) as conn:
+    db_path = get_settings().furnace_db_path
+    if not os.path.exists(db_path):
+        os.makedirs(os.path.dirname(db_path))
+        with sqlite3.connect(db_path) as conn:
             conn.execute('''CREATE TABLE IF NOT EXISTS saved_curves (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 curve_name TEXT NOT NULL,